@@ -5,8 +5,10 @@ Provides flexible querying capabilities for cells with wildcard support,
 range filters, and complex criteria matching.
 """
 
+from functools import lru_cache
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field
+import numpy as np
 import re
 
 
@@ -76,6 +78,12 @@ class CellQuery(BaseModel):
         }
 
 
+@lru_cache(maxsize=256)
+def _compile_pattern(pattern: str) -> "re.Pattern":
+    """Compile a * wildcard pattern to an anchored regex (cached per pattern)"""
+    return re.compile('^' + pattern.replace('*', '.*') + '$')
+
+
 def matches_pattern(value: str, pattern: str) -> bool:
     """
     Check if value matches pattern with wildcard (*) support.
@@ -96,9 +104,7 @@ def matches_pattern(value: str, pattern: str) -> bool:
     if '*' not in pattern:
         return value == pattern
     
-    # Convert wildcard pattern to regex
-    regex = '^' + pattern.replace('*', '.*') + '$'
-    return re.match(regex, value) is not None
+    return _compile_pattern(pattern).match(value) is not None
 
 
 def matches_query_criteria(cell: Dict[str, Any], query: CellQuery) -> bool:
@@ -164,6 +170,110 @@ def matches_query_criteria(cell: Dict[str, Any], query: CellQuery) -> bool:
     return True
 
 
+def _pattern_mask(column, pattern: str) -> np.ndarray:
+    """Vectorized matches_pattern over a pandas string column"""
+    if '*' not in pattern:
+        return (column == pattern).to_numpy(dtype=bool)
+    return column.str.match(_compile_pattern(pattern), na=False).to_numpy(dtype=bool)
+
+
+def query_mask(df, query: CellQuery) -> np.ndarray:
+    """
+    Evaluate query criteria over a cells DataFrame in one vectorized pass.
+    
+    Column-wise equivalent of matches_query_criteria: each criterion is a
+    NumPy boolean column, and cells whose tilt is unset (NaN) fail every
+    tilt filter just as None does in the row-wise check.
+    
+    Args:
+        df: DataFrame from sim.cells_frame() (one row per cell)
+        query: CellQuery object with filter criteria
+        
+    Returns:
+        Boolean array, True where the cell matches all specified criteria
+    """
+    def num(col):
+        return df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+    
+    mask = np.ones(len(df), dtype=bool)
+    
+    # Name patterns with wildcard support
+    if query.cell_name:
+        mask &= _pattern_mask(df['cell_name'], query.cell_name)
+    if query.site_name:
+        mask &= _pattern_mask(df['site_name'], query.site_name)
+    
+    # Exact matches
+    if query.band:
+        mask &= df['band'].to_numpy() == query.band
+    if query.sector_id is not None:
+        mask &= df['sector_id'].to_numpy() == query.sector_id
+    if query.site_idx is not None:
+        mask &= df['site_idx'].to_numpy() == query.site_idx
+    
+    # Antenna configuration
+    if query.bs_rows is not None:
+        mask &= df['bs_rows'].to_numpy() == query.bs_rows
+    if query.bs_cols is not None:
+        mask &= df['bs_cols'].to_numpy() == query.bs_cols
+    if query.bs_pol:
+        mask &= df['bs_pol'].to_numpy() == query.bs_pol
+    if query.antenna_pattern:
+        mask &= df['antenna_pattern'].to_numpy() == query.antenna_pattern
+    
+    # Frequency filters
+    if query.fc_ghz is not None or query.fc_ghz_min is not None or query.fc_ghz_max is not None:
+        fc = num('fc_GHz')
+        if query.fc_ghz is not None:
+            mask &= np.abs(fc - query.fc_ghz) <= 0.001
+        if query.fc_ghz_min is not None:
+            mask &= fc >= query.fc_ghz_min
+        if query.fc_ghz_max is not None:
+            mask &= fc <= query.fc_ghz_max
+    
+    # Tilt filters (NaN comparisons are False, so unset tilts never match)
+    if query.tilt_deg is not None or query.tilt_min is not None or query.tilt_max is not None:
+        tilt = num('tilt_deg')
+        if query.tilt_deg is not None:
+            mask &= np.abs(tilt - query.tilt_deg) <= 0.001
+        if query.tilt_min is not None:
+            mask &= tilt >= query.tilt_min
+        if query.tilt_max is not None:
+            mask &= tilt <= query.tilt_max
+    
+    # Power filters
+    if query.power_min is not None or query.power_max is not None:
+        power = num('tx_rs_power_dbm')
+        if query.power_min is not None:
+            mask &= power >= query.power_min
+        if query.power_max is not None:
+            mask &= power <= query.power_max
+    
+    return mask
+
+
+def _candidate_indices(sim, query: CellQuery) -> Optional[List[int]]:
+    """
+    Narrow a query to the cells of one site (and sector) using the sim's
+    site/sector indexes, when it names an exact site.
+    
+    Returns sorted cell indices that may match, or None when the query
+    doesn't pin a site and every cell is a candidate.
+    """
+    site_idx = query.site_idx
+    if query.site_name and '*' not in query.site_name:
+        named = sim._site_idx_by_name.get(query.site_name)
+        if named is None or (site_idx is not None and site_idx != named):
+            return []
+        site_idx = named
+    if site_idx is None:
+        return None
+    
+    sectors = (query.sector_id,) if query.sector_id is not None else (0, 1, 2)
+    by_site_sector = sim._cells_by_site_sector
+    return sorted(i for s in sectors for i in by_site_sector.get((site_idx, s), ()))
+
+
 def query_cells(sim, query: CellQuery) -> Dict[str, Any]:
     """
     Query cells from simulation with flexible filtering.
@@ -191,20 +301,32 @@ def query_cells(sim, query: CellQuery) -> Dict[str, Any]:
     # Get all cells
     all_cells = sim.cells_table()
     
-    # Apply filters
-    filtered_cells = [
-        cell for cell in all_cells 
-        if matches_query_criteria(cell, query)
-    ]
+    # Apply filters as a list of matching cell indices. A query that names an
+    # exact site is first narrowed to that site's cells; the remaining
+    # criteria are then evaluated vectorized over the cached cells DataFrame
+    # when available, else row-wise.
+    candidates = _candidate_indices(sim, query)
+    df = sim.cells_frame() if all_cells and candidates != [] else None
+    if df is not None:
+        if candidates is None:
+            matched = np.flatnonzero(query_mask(df, query)).tolist()
+        else:
+            idx = np.asarray(candidates, dtype=np.intp)
+            matched = idx[query_mask(df.take(idx), query)].tolist()
+    else:
+        if candidates is None:
+            candidates = range(len(all_cells))
+        matched = [i for i in candidates if matches_query_criteria(all_cells[i], query)]
     
     # Sort if requested
-    if query.sort_by and filtered_cells:
+    if query.sort_by and matched:
         # Check if sort field exists
-        if query.sort_by in filtered_cells[0]:
+        if query.sort_by in all_cells[0]:
+            field = query.sort_by
             try:
                 # Handle None values in sorting
-                filtered_cells.sort(
-                    key=lambda c: (c[query.sort_by] is None, c[query.sort_by]),
+                matched.sort(
+                    key=lambda i: (all_cells[i][field] is None, all_cells[i][field]),
                     reverse=query.sort_desc
                 )
             except (TypeError, KeyError):
@@ -212,13 +334,14 @@ def query_cells(sim, query: CellQuery) -> Dict[str, Any]:
                 pass
     
     # Count total matches before pagination
-    total_matches = len(filtered_cells)
+    total_matches = len(matched)
     
-    # Apply pagination
+    # Apply pagination to the indices, then build only the returned page
     if query.limit:
-        filtered_cells = filtered_cells[query.offset:query.offset + query.limit]
+        matched = matched[query.offset:query.offset + query.limit]
     elif query.offset > 0:
-        filtered_cells = filtered_cells[query.offset:]
+        matched = matched[query.offset:]
+    filtered_cells = [all_cells[i] for i in matched]
     
     return {
         "cells": filtered_cells,
@@ -129,12 +129,8 @@ def update_cell_config(sim, request: CellUpdateRequest) -> dict:
         if cell_id < 0 or cell_id >= len(sim.cells):
             raise ValueError(f"Invalid cell_id: {cell_id} (valid range: 0-{len(sim.cells)-1})")
     elif request.cell_name is not None:
-        # Find cell by name
-        cell_id = None
-        for idx, cell in enumerate(sim.cells):
-            if cell.get('name') == request.cell_name:
-                cell_id = idx
-                break
+        # Find cell by name (indexed on the sim)
+        cell_id = sim._cell_idx_by_name.get(request.cell_name)
         if cell_id is None:
             raise ValueError(f"Cell not found: {request.cell_name}")
     else:
@@ -410,7 +406,7 @@ def update_cells_by_query(sim, request: QueryBasedUpdateRequest, query_cells_fun
             - results: List of update results
             - errors: List of errors (if any)
     """
-    from cell_query import CellQuery
+    from api.cell_query import CellQuery
     
     # Build query from request
     query = CellQuery(
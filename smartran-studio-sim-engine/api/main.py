@@ -29,12 +29,14 @@ Architecture:
 
 Threading Model:
     - Async request handling on main thread
-    - Blocking TensorFlow compute offloaded to thread pool
+    - Blocking TensorFlow compute offloaded to a single-worker GPU pool
+    - Report building and ArangoDB writes offloaded to a separate I/O pool
     - Locks to serialize GPU access and protect configuration
+      (readers-writer lock: GET endpoints share it, mutations are exclusive)
 
 Example Usage:
     # Start the API server
-    uvicorn api.main:app --host 0.0.0.0 --port 8000
+    uvicorn api.main:app --host 0.0.0.0 --port 8000 --loop uvloop --http httptools
     
     # Initialize simulation (via curl)
     curl -X POST http://localhost:8000/initialize \\
@@ -48,35 +50,49 @@ Author: Cognitive Network Solutions Inc.
 License: Apache 2.0
 """
 
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse, Response
 from simulation.engine import MultiCellSim
-from simulation.helpers import rsrp_rows_as_dicts
+from simulation.helpers import iter_rsrp_rows_as_dicts, get_or_build_labels, rsrp_arrow_ipc
 from api.cell_query import CellQuery, query_cells
 from api.cell_update import CellUpdateRequest, BulkCellUpdateRequest, QueryBasedUpdateRequest, update_cell_config, update_cells_bulk, update_cells_by_query
 from api.ue_management import UEDropRequest, get_ue_info, drop_ues
 from simulation.initialization import SimInitializationRequest, initialize_simulation
 import numpy as np
 import uvicorn
-from typing import Optional, Dict, Any, List, Union
+from typing import Optional, Dict, Any, List, Union, Literal
 from pydantic import BaseModel, validator, Field
 import logging
 import asyncio
+import aiorwlock
 import concurrent.futures
 from functools import partial
+from itertools import islice
 from db.arango_client import init_arango
-from db.persist_run import persist_run
-import re
+from db.persist_run import persist_run, cursor_full_count
+import os
+import orjson
+from contextlib import asynccontextmanager
 
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _dumps(content: Any) -> bytes:
+    """Encode a response body with orjson, passing NumPy scalars/arrays through natively"""
+    return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
+class NumpyORJSONResponse(ORJSONResponse):
+    """ORJSONResponse that also serializes NumPy scalars/arrays natively"""
+    def render(self, content: Any) -> bytes:
+        return _dumps(content)
+
 app = FastAPI(
     title="SmartRAN Studio Simulation API",
     description="FastAPI interface for SmartRAN Studio Sionna multi-cell simulation",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=NumpyORJSONResponse,
 )
 
 db = None
@@ -86,15 +102,67 @@ sim_reports = None
 # Global simulation instance
 sim: Optional[MultiCellSim] = None
 
-# Thread pool for blocking operations (releases GIL)
-thread_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="compute")
+# Thread pools for blocking operations (release GIL)
+# GPU compute stays single-threaded; report building and Arango persistence
+# run on a separate pool so they don't queue behind the next compute.
+gpu_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="gpu")
+io_pool = concurrent.futures.ThreadPoolExecutor(max_workers=min(8, (os.cpu_count() or 4)), thread_name_prefix="io")
 
 # Concurrency locks
 compute_lock = asyncio.Lock()    # Serialize GPU compute operations
-config_lock = asyncio.Lock()     # Protect configuration reads/writes
+config_lock = aiorwlock.RWLock() # Protect configuration: shared reads, exclusive writes
 
-# Compute state tracking
-compute_in_progress = False
+class SimState:
+    """
+    Simulation lifecycle state: "idle", "computing" or "updating".
+    
+    `value` is a plain attribute, so readers see the state without any lock.
+    Transitions are check-and-set methods with no await between the check
+    and the set, which makes them atomic on the event loop. Config updates
+    may overlap each other (config_lock serializes them); compute waits for
+    in-flight updates to finish, and new updates are refused (409) while a
+    compute is running or waiting to start, so compute can't be starved.
+    """
+    def __init__(self):
+        self.value = "idle"
+        self._updaters = 0
+        self._compute_pending = False
+        self._idle = asyncio.Event()
+        self._idle.set()
+    
+    def _set(self, value: str):
+        self.value = value
+        if value == "idle":
+            self._idle.set()
+        else:
+            self._idle.clear()
+    
+    def try_begin_update(self) -> bool:
+        if self.value == "computing" or self._compute_pending:
+            return False
+        self._updaters += 1
+        self._set("updating")
+        return True
+    
+    def end_update(self):
+        self._updaters -= 1
+        if self._updaters == 0:
+            self._set("idle")
+    
+    async def begin_compute(self):
+        """Wait for in-flight updates to drain, then enter "computing" (callers hold compute_lock)"""
+        self._compute_pending = True
+        try:
+            while self.value != "idle":
+                await self._idle.wait()
+            self._set("computing")
+        finally:
+            self._compute_pending = False
+    
+    def end_compute(self):
+        self._set("idle")
+
+sim_state = SimState()
 
 # Pydantic models for request bodies
 class CellTiltUpdate(BaseModel):
@@ -155,6 +223,14 @@ class AddCellRequest(BaseModel):
     elem_h_spacing: Optional[float] = Field(None, description="Element spacing (horizontal)")
     antenna_pattern: Optional[str] = Field(None, description="Antenna pattern model")
 
+class AddSitesBatchRequest(BaseModel):
+    """Request to add several sites in one call"""
+    sites: List[AddSiteRequest]
+
+class AddCellsBatchRequest(BaseModel):
+    """Request to add several cells in one call"""
+    cells: List[AddCellRequest]
+
 def check_sim_initialized():
     """Check if simulation is initialized, raise HTTPException if not"""
     if sim is None:
@@ -163,24 +239,92 @@ def check_sim_initialized():
             detail="Simulation not initialized. Call POST /initialize first."
         )
 
-def check_config_changes_allowed():
-    """Check if configuration changes are allowed (not during compute)"""
-    check_sim_initialized()
-    if compute_in_progress:
+@asynccontextmanager
+async def config_update(action: str = "modify configuration"):
+    """
+    Enter the "updating" state and hold config_lock.writer for a config change.
+    Raises 409 if a compute is running (or about to start).
+    """
+    if not sim_state.try_begin_update():
         raise HTTPException(
             status_code=409,  # Conflict
-            detail="Cannot modify configuration while compute is in progress. Please wait for compute to complete."
+            detail=f"Cannot {action} while compute is in progress. Please wait for compute to complete."
         )
+    try:
+        async with config_lock.writer:
+            yield
+    finally:
+        sim_state.end_update()
 
-def find_cell_id_by_name(cell_name: str) -> int:
-    """Find cell index by cell name"""
-    check_sim_initialized()
+def _get_name_index(sim) -> Dict[str, int]:
+    """Return the sim's {cell_name: index} map (kept up to date by MultiCellSim; read-only)"""
+    return sim._cell_idx_by_name
+
+def _get_status_snapshot(sim) -> Dict[str, Any]:
+    """
+    Return the cached config-derived part of the /status response.
     
-    for i, cell in enumerate(sim.cells):
-        if cell.get('name') == cell_name:
-            return i
+    The snapshot is rebuilt (and published as a new dict) only when the
+    site/cell config or the UE drop has changed since it was last built,
+    so readers never need config_lock to see a coherent view.
+    """
+    key = (sim._config_version, sim._ue_version)
+    cached = sim._status_snapshot
+    if cached is None or cached[0] != key:
+        metadata = sim.get_metadata(include_time=False, auto_increment=False)
+        cached = (key, {
+            "num_sites": len(sim.sites),
+            "num_cells": len(sim.cells),
+            "num_ues": metadata["num_users"],
+            "num_bands": metadata["num_bands"],
+            "bands": metadata["bands"],
+            "cells_chunk": sim.cells_chunk,
+            "ue_chunk": sim.ue_chunk,
+        })
+        sim._status_snapshot = cached
+    return cached[1]
+
+def _cached_payload(sim, name: str, build) -> bytes:
+    """
+    Return the orjson-encoded body for a config-derived GET response.
     
-    raise HTTPException(status_code=404, detail=f"Cell name '{cell_name}' not found")
+    The encoded bytes are cached on sim per _config_version, so repeated
+    polls of an unchanged config skip both table building and serialization.
+    """
+    entry = sim._payload_cache.get(name)
+    if entry is None or entry[0] != sim._config_version:
+        version = sim._config_version
+        entry = (version, _dumps(build()))
+        sim._payload_cache[name] = entry
+    return entry[1]
+
+def _aql_fetch(query: str, **kwargs):
+    """Execute an AQL query and drain its cursor; returns (results, cursor)"""
+    cursor = db.aql.execute(query, **kwargs)
+    return list(cursor), cursor
+
+def _ndjson_chunk(rows, size: int) -> bytes:
+    """
+    Encode up to size items from an iterator as NDJSON (b"" when exhausted).
+    Blocking: pulling from a python-arango cursor may fetch its next batch.
+    """
+    return b"".join(orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE) for row in islice(rows, size))
+
+async def _stream_ndjson(rows, size: int = 1000):
+    """Async NDJSON body for StreamingResponse, encoding each chunk on io_pool"""
+    while True:
+        chunk = await run_blocking(_ndjson_chunk, rows, size)
+        if not chunk:
+            return
+        yield chunk
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking call on io_pool so the event loop stays free"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(io_pool, partial(func, *args, **kwargs))
+
+# python-arango calls are blocking too
+run_db = run_blocking
 
 @app.on_event("startup")
 async def startup_event():
@@ -195,6 +339,11 @@ async def startup_event():
 
     sim_runs = db.collection("sim_runs")
     sim_reports = db.collection("sim_reports")
+
+    # Indexes for per-run report lookups/pagination and run-name filtering
+    # (ensure-style: a no-op if an identical index already exists)
+    sim_reports.add_persistent_index(fields=["run_id", "user_id"], in_background=True)
+    sim_runs.add_persistent_index(fields=["metadata.name"], in_background=True)
     print("✅ Connected to ArangoDB:", db.name)
     logger.info(f"✅ Connected to ArangoDB: {db.name}")
     logger.info("CNS Sionna Simulation API started")
@@ -203,8 +352,40 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
-    logger.info("Shutting down thread pool...")
-    thread_pool.shutdown(wait=True)
+    logger.info("Shutting down thread pools...")
+    gpu_pool.shutdown(wait=True)
+    io_pool.shutdown(wait=True)
+
+async def _initialize_simulation_locked(config: SimInitializationRequest) -> Dict[str, Any]:
+    """
+    Build a new simulation from config and install it as the global sim.
+    Caller holds config_update() (i.e. config_lock.writer); the build itself
+    runs on the GPU pool, off the event loop.
+    """
+    global sim
+    
+    if sim is not None:
+        logger.warning("Simulation already initialized - replacing with new configuration")
+    
+    loop = asyncio.get_event_loop()
+    result = await loop.run_in_executor(gpu_pool, initialize_simulation, config)
+    new_sim = result['sim']
+    
+    # Store the init config on the sim object for later reference
+    new_sim.init_config = config.model_dump()
+    new_sim.init_config_summary = result['config_summary']
+    sim = new_sim
+    
+    return {
+        "message": "Simulation initialized successfully",
+        "num_sites": result['num_sites'],
+        "num_cells": result['num_cells'],
+        "num_ues": result['num_ues'],
+        "high_band_cells": result['num_hi_cells'],
+        "low_band_cells": result['num_lo_cells'],
+        "config": result['config_summary'],
+        "status": "success"
+    }
 
 @app.post("/initialize")
 async def initialize_endpoint(config: SimInitializationRequest):
@@ -239,38 +420,10 @@ async def initialize_endpoint(config: SimInitializationRequest):
       "num_ue": 50000
     }
     """
-    global sim
-    
-    # Check if compute is running before allowing initialization/reinitialization
-    if compute_in_progress:
-        raise HTTPException(
-            status_code=409,
-            detail="Cannot initialize simulation while compute is in progress. Please wait for compute to complete."
-        )
-    
-    async with config_lock:
+    # Refused with 409 while compute is running
+    async with config_update("initialize simulation"):
         try:
-            if sim is not None:
-                logger.warning("Simulation already initialized - replacing with new configuration")
-            
-            result = initialize_simulation(config)
-            sim = result['sim']
-            
-            # Store the init config on the sim object for later reference
-            sim.init_config = config.dict()
-            sim.init_config_summary = result['config_summary']
-            
-            return {
-                "message": "Simulation initialized successfully",
-                "num_sites": result['num_sites'],
-                "num_cells": result['num_cells'],
-                "num_ues": result['num_ues'],
-                "high_band_cells": result['num_hi_cells'],
-                "low_band_cells": result['num_lo_cells'],
-                "config": result['config_summary'],
-                "status": "success"
-            }
-            
+            return await _initialize_simulation_locked(config)
         except Exception as e:
             logger.error(f"Error initializing simulation: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Failed to initialize simulation: {str(e)}")
@@ -285,21 +438,17 @@ async def get_status():
     """Get simulation status and configuration"""
     check_sim_initialized()
     
-    # Protect config reads for consistency
-    async with config_lock:
-        metadata = sim.get_metadata(include_time=True)
-        
-        return {
-            "simulation_status": "ready",
-            "num_sites": len(sim.sites),
-            "num_cells": len(sim.cells),
-            "num_ues": metadata["num_users"],
-            "num_bands": metadata["num_bands"],
-            "bands": metadata["bands"],
-            "cells_chunk": getattr(sim, 'cells_chunk', None),
-            "ue_chunk": getattr(sim, 'ue_chunk', None),
-            "metadata": metadata
-        }
+    # Lock-free read: config mutators bump the sim's version counters when
+    # they finish, so a snapshot taken mid-mutation is rebuilt on the next poll
+    snapshot = _get_status_snapshot(sim)
+    metadata = sim.get_metadata(include_time=True)
+    
+    return {
+        "simulation_status": "ready",
+        "sim_state": sim_state.value,  # "idle" | "computing" | "updating"
+        **snapshot,
+        "metadata": metadata
+    }
 
 @app.post("/measurement-reports")
 async def get_measurement_reports(
@@ -307,6 +456,9 @@ async def get_measurement_reports(
     threshold_dbm: float = -120.0,
     label_mode: str = "name",
     return_payload: bool = False,  # optional: keep False in prod
+    precision: Optional[int] = 2,
+    response_format: Literal["json", "ndjson", "arrow"] = Query("json", alias="format"),
+    quantize: bool = False,
 ):
     """
     Run fresh simulation, store reports to Arango, and return a pointer to the run.
@@ -315,55 +467,67 @@ async def get_measurement_reports(
         threshold_dbm: RSRP threshold in dBm
         label_mode: Label mode for reports ('name' or 'idx')
         return_payload: Whether to include full payload in response
+        precision: Decimals RSRP readings are rounded to (default 2, i.e. 0.01 dB);
+            omit/null to keep full float32 precision
+        format: "json" (default) returns the run pointer (plus the reports if
+            return_payload); "ndjson" stores the run the same way and then streams
+            every report, one JSON object per line, with the run id in X-Run-Id
+            and the report count in X-Total-Count; "arrow" stores the run but returns the
+            full RSRP matrix as an Arrow IPC stream (one row per UE, one float32
+            column per cell, null below threshold) with the run id in X-Run-Id
+        quantize: With format=arrow, send cell columns as int16 centi-dB
+            (dBm * 100) instead of float32; ignored for JSON, where precision
+            already bounds the digits sent
     """
-    global compute_in_progress
     check_sim_initialized()
 
     try:
         # --- serialize compute ---
         async with compute_lock:
-            compute_in_progress = True
+            await sim_state.begin_compute()
             try:
                 loop = asyncio.get_event_loop()
 
-                # 0) Mint run_id ONCE (no timestep increment side-effect)
-                meta_for_id = sim.get_metadata(include_time=True, auto_increment=False)
-                run_id = meta_for_id["timestamp"]        # e.g. "2025-11-06_00-05-22"
-                unix_ts = meta_for_id.get("unix_timestamp")
+                # 0) Mint run_id and base metadata in one call (advances the timestep once)
+                base_meta, run_id, unix_ts = sim.get_metadata_and_id()  # run_id e.g. "2025-11-06_00-05-22"
 
-                # 1) Compute
+                # 1) Compute (config can't change while sim_state is "computing")
                 logger.info(f"[{run_id}] Running compute…")
-                RSRP_dBm, cells_meta = await loop.run_in_executor(thread_pool, sim.compute)
+                config_version = sim._config_version
+                RSRP_dBm, cells_meta = await loop.run_in_executor(gpu_pool, sim.compute)
+                ue_xy = sim._ue_xy  # [U, 2] x,y cached at UE drop, matching this compute
                 logger.info(f"[{run_id}] Compute done: RSRP shape={RSRP_dBm.shape}")
             finally:
-                compute_in_progress = False
+                sim_state.end_compute()
 
-        # 2) Build per-user measurement dicts (same as before)
+        # 2) Build per-user measurement dicts lazily; persist_run consumes them in batches
         logger.info(f"[{run_id}] Building measurement reports (thr={threshold_dbm} dBm)")
-        ue_meas_reports = await loop.run_in_executor(
-            thread_pool,
-            partial(
-                rsrp_rows_as_dicts,
-                RSRP_dBm,
-                cells_meta,
-                threshold_dbm=threshold_dbm,
-                label_mode=label_mode,
-                ue_locations=sim.ue_loc[0],  # [U, 3] -> x,y from [:,0:2]
-            ),
+        num_reports = int(RSRP_dBm.shape[0])
+        labels = get_or_build_labels(sim, cells_meta, label_mode, version=config_version)
+        report_rows = partial(
+            iter_rsrp_rows_as_dicts,
+            RSRP_dBm,
+            cells_meta,
+            threshold_dbm=threshold_dbm,
+            label_mode=label_mode,
+            ue_locations=ue_xy,
+            precision=precision,
+            labels=labels,
         )
+        ue_meas_reports = report_rows()
+        if return_payload and response_format == "json":
+            # The payload is returned to the client, so it has to be materialized anyway
+            ue_meas_reports = await loop.run_in_executor(io_pool, list, ue_meas_reports)
 
-        # 3) Get metadata (no new timestamp) and enforce the same run_id in it
-        async with config_lock:
-            base_meta = sim.get_metadata(include_time=False)
+        # 3) Snapshot cell states and init config; reuse the base metadata from step 0
+        async with config_lock.reader:
             # Capture current cell states (all tilts and configurations)
             cell_states = sim.cells_table()
             # Get init config (stored during initialization)
-            init_config = getattr(sim, 'init_config', {})
-            init_config_summary = getattr(sim, 'init_config_summary', {})
+            init_config = sim.init_config
+            init_config_summary = sim.init_config_summary
         
-        metadata = {**base_meta, "timestamp": run_id, "name": name}
-        if unix_ts is not None:
-            metadata["unix_timestamp"] = unix_ts
+        metadata = {**base_meta, "timestamp": run_id, "name": name, "unix_timestamp": unix_ts}
         
         # Add init_config and cell_states to metadata
         metadata["init_config"] = init_config
@@ -372,7 +536,7 @@ async def get_measurement_reports(
 
         # 4) Persist to Arango (run header + one doc per user)
         await loop.run_in_executor(
-            thread_pool,
+            io_pool,
             persist_run,
             sim_runs,
             sim_reports,
@@ -383,11 +547,32 @@ async def get_measurement_reports(
             label_mode,
         )
 
+        if response_format == "arrow":
+            body = await loop.run_in_executor(
+                io_pool,
+                partial(rsrp_arrow_ipc, RSRP_dBm, labels,
+                        threshold_dbm=threshold_dbm, ue_locations=ue_xy,
+                        quantize=quantize),
+            )
+            return Response(
+                content=body,
+                media_type="application/vnd.apache.arrow.stream",
+                headers={"X-Run-Id": run_id},
+            )
+
+        if response_format == "ndjson":
+            # persist_run consumed the first generator; a fresh one streams the same rows
+            return StreamingResponse(
+                _stream_ndjson(report_rows()),
+                media_type="application/x-ndjson",
+                headers={"X-Total-Count": str(num_reports), "X-Run-Id": run_id},
+            )
+
         # 5) Return pointer (optionally include big payload if return_payload=True)
         resp = {
             "run_id": run_id,
             "status": "stored",
-            "num_reports": len(ue_meas_reports),
+            "num_reports": num_reports,
             "threshold_dbm": threshold_dbm,
             "label_mode": label_mode,
             "access": {
@@ -399,6 +584,9 @@ async def get_measurement_reports(
         if return_payload:
             resp["measurement_reports"] = ue_meas_reports
             resp["metadata"] = metadata
+            # The full payload can be tens of MB; encode it off the event loop
+            body = await loop.run_in_executor(io_pool, _dumps, resp)
+            return Response(content=body, media_type="application/json")
         return resp
 
     except Exception as e:
@@ -426,25 +614,31 @@ async def list_runs(
         List of runs with metadata (newest first by default)
     """
     try:
-        # Build AQL query
+        # Build AQL query (page + total count in one round-trip).
+        # Sort direction can't be a bind parameter, so it is whitelisted here.
         sort_direction = "DESC" if sort_order.lower() == "desc" else "ASC"
         query = f"""
-        FOR run IN sim_runs
-            SORT run.@sort_by {sort_direction}
-            LIMIT @offset, @limit
-            RETURN {{
-                run_id: run._key,
-                name: run.metadata.name,
-                created_at: run.created_at,
-                num_reports: run.num_reports,
-                num_sites: run.metadata.init_config_summary.n_sites,
-                num_cells: LENGTH(run.metadata.cell_states_at_run),
-                num_ues: run.metadata.num_users,
-                bands: run.metadata.bands
-            }}
+        LET total = LENGTH(sim_runs)
+        LET page = (
+            FOR run IN sim_runs
+                SORT run.@sort_by {sort_direction}
+                LIMIT @offset, @limit
+                RETURN {{
+                    run_id: run._key,
+                    name: run.metadata.name,
+                    created_at: run.created_at,
+                    num_reports: run.num_reports,
+                    num_sites: run.metadata.init_config_summary.n_sites,
+                    num_cells: LENGTH(run.metadata.cell_states_at_run),
+                    num_ues: run.metadata.num_users,
+                    bands: run.metadata.bands
+                }}
+        )
+        RETURN {{ total, page }}
         """
         
-        cursor = db.aql.execute(
+        rows, _ = await run_db(
+            _aql_fetch,
             query,
             bind_vars={
                 "sort_by": sort_by,
@@ -452,15 +646,11 @@ async def list_runs(
                 "limit": limit
             }
         )
-        runs = list(cursor)
-        
-        # Get total count
-        count_query = "RETURN LENGTH(sim_runs)"
-        total_count = list(db.aql.execute(count_query))[0]
+        result = rows[0]
         
         return {
-            "runs": runs,
-            "total": total_count,
+            "runs": result["page"],
+            "total": result["total"],
             "limit": limit,
             "offset": offset,
             "status": "success"
@@ -484,7 +674,7 @@ async def get_run(run_id: str):
     """
     try:
         # Get run from sim_runs collection
-        run_doc = sim_runs.get(run_id)
+        run_doc = await run_db(sim_runs.get, run_id)
         
         if not run_doc:
             raise HTTPException(status_code=404, detail=f"Run '{run_id}' not found")
@@ -512,7 +702,8 @@ async def get_run_reports(
     limit: int = 1000,
     offset: int = 0,
     user_id_min: Optional[int] = None,
-    user_id_max: Optional[int] = None
+    user_id_max: Optional[int] = None,
+    response_format: Literal["json", "ndjson"] = Query("json", alias="format"),
 ):
     """
     Get measurement reports for a specific run with pagination.
@@ -523,13 +714,16 @@ async def get_run_reports(
         offset: Number of reports to skip (default: 0)
         user_id_min: Filter for user IDs >= this value (optional)
         user_id_max: Filter for user IDs <= this value (optional)
+        format: "json" (default) for a single JSON object, or "ndjson" to
+            stream one report per line straight from the Arango cursor, with
+            the total match count in the X-Total-Count header
     
     Returns:
         Paginated list of measurement reports for the run
     """
     try:
         # Check if run exists
-        if not sim_runs.has(run_id):
+        if not await run_db(sim_runs.has, run_id):
             raise HTTPException(status_code=404, detail=f"Run '{run_id}' not found")
         
         # Build AQL query with optional filters
@@ -546,6 +740,8 @@ async def get_run_reports(
         
         filter_clause = " AND ".join(filters)
         
+        # Page + total count in one scan: full_count reports the number of
+        # matches before LIMIT, served by the (run_id, user_id) index
         query = f"""
         FOR doc IN sim_reports
             FILTER {filter_clause}
@@ -559,17 +755,18 @@ async def get_run_reports(
             }}
         """
         
-        cursor = db.aql.execute(query, bind_vars=bind_vars)
-        reports = list(cursor)
+        if response_format == "ndjson":
+            cursor = await run_db(db.aql.execute, query, bind_vars=bind_vars, full_count=True)
+            total_count = cursor_full_count(cursor)
+            
+            return StreamingResponse(
+                _stream_ndjson(cursor),
+                media_type="application/x-ndjson",
+                headers={"X-Total-Count": str(total_count), "X-Run-Id": run_id},
+            )
         
-        # Get total count for this run
-        count_query = f"""
-        FOR doc IN sim_reports
-            FILTER {filter_clause}
-            COLLECT WITH COUNT INTO total
-            RETURN total
-        """
-        total_count = list(db.aql.execute(count_query, bind_vars={k: v for k, v in bind_vars.items() if k != 'offset' and k != 'limit'}))[0]
+        reports, cursor = await run_db(_aql_fetch, query, bind_vars=bind_vars, full_count=True)
+        total_count = cursor_full_count(cursor)
         
         return {
             "run_id": run_id,
@@ -600,22 +797,14 @@ async def delete_run(run_id: str):
     """
     try:
         # Check if run exists
-        if not sim_runs.has(run_id):
+        if not await run_db(sim_runs.has, run_id):
             raise HTTPException(status_code=404, detail=f"Run '{run_id}' not found")
         
-        # Delete all reports for this run
-        delete_reports_query = """
-        FOR doc IN sim_reports
-            FILTER doc.run_id == @run_id
-            REMOVE doc IN sim_reports
-            COLLECT WITH COUNT INTO deleted
-            RETURN deleted
-        """
-        cursor = db.aql.execute(delete_reports_query, bind_vars={"run_id": run_id})
-        num_reports_deleted = list(cursor)[0]
+        # Delete all reports for this run (served by the run_id index; returns the count)
+        num_reports_deleted = await run_db(sim_reports.delete_match, {"run_id": run_id})
         
         # Delete the run header
-        sim_runs.delete(run_id)
+        await run_db(sim_runs.delete, run_id)
         
         logger.info(f"Deleted run {run_id} and {num_reports_deleted} associated reports")
         
@@ -649,61 +838,74 @@ async def update_cell_tilts(request: CellTiltUpdates):
     Returns:
         Summary of updates applied
     """
-    check_config_changes_allowed()
+    check_sim_initialized()
     
     if not request.updates:
         raise HTTPException(status_code=400, detail="No updates provided")
     
-    # Protect configuration modifications
-    async with config_lock:
+    # Protect configuration modifications (409 while compute is running)
+    async with config_update():
         try:
             updated_cells = []
             failed_updates = []
             
+            # Resolve every (cell_id, tilt) pair up front, then apply them in one call
+            num_cells = len(sim.cells)
+            name_index = _get_name_index(sim)
+            ids, tilts, identifiers = [], [], []
             for update in request.updates:
-                try:
-                    # Determine cell_id from either cell_id or cell_name
-                    if update.cell_id is not None:
-                        cell_id = update.cell_id
-                        identifier = f"cell_id={cell_id}"
-                    else:
-                        cell_id = find_cell_id_by_name(update.cell_name)
-                        identifier = f"cell_name='{update.cell_name}'"
-                    
-                    # Validate cell_id exists
-                    if cell_id < 0 or cell_id >= len(sim.cells):
+                # Determine cell_id from either cell_id or cell_name
+                if update.cell_id is not None:
+                    cell_id = update.cell_id
+                    identifier = f"cell_id={cell_id}"
+                else:
+                    identifier = f"cell_name='{update.cell_name}'"
+                    cell_id = name_index.get(update.cell_name)
+                    if cell_id is None:
                         failed_updates.append({
                             "identifier": identifier,
-                            "error": f"Cell ID {cell_id} out of range (0-{len(sim.cells)-1})"
+                            "error": f"404: Cell name '{update.cell_name}' not found"
                         })
                         continue
-                    
-                    # Get old tilt for logging
-                    old_tilt = sim.cells[cell_id].get('tilt_deg')
-                    
-                    # Update the cell tilt
-                    sim.update_cell(cell_id, tilt_deg=update.tilt_deg)
-                    
-                    # Get cell info for response
-                    cell_info = sim.get_cell(cell_id)
+                
+                # Validate cell_id exists
+                if cell_id < 0 or cell_id >= num_cells:
+                    failed_updates.append({
+                        "identifier": identifier,
+                        "error": f"Cell ID {cell_id} out of range (0-{num_cells-1})"
+                    })
+                    continue
+                
+                ids.append(cell_id)
+                tilts.append(update.tilt_deg)
+                identifiers.append(identifier)
+            
+            if ids:
+                # Old tilt per entry as seen just before that entry is applied
+                # (update_cells applies in order, so a repeated id sees the
+                # tilt set by its previous entry)
+                current = {}
+                old_tilts = []
+                for i, t in zip(ids, tilts):
+                    old_tilts.append(current.get(i, sim.cells[i].get('tilt_deg')))
+                    current[i] = t
+                sim.update_cells(np.fromiter(ids, dtype=np.int64, count=len(ids)),
+                                 np.fromiter(tilts, dtype=np.float64, count=len(tilts)))
+                
+                for cell_id, old_tilt, new_tilt, identifier, cell_info in zip(
+                        ids, old_tilts, tilts, identifiers, sim.get_cells(ids)):
                     updated_cells.append({
                         "cell_id": cell_id,
                         "cell_name": cell_info["cell_name"],
                         "old_tilt_deg": old_tilt,
-                        "new_tilt_deg": update.tilt_deg,
+                        "new_tilt_deg": new_tilt,
                         "band": cell_info["band"],
                         "site_name": cell_info["site_name"],
                         "sector_id": cell_info["sector_id"],
                         "identifier_used": identifier
                     })
-                    
-                    logger.info(f"Updated cell {cell_id} ({cell_info['cell_name']}) tilt: {old_tilt}° → {update.tilt_deg}° via {identifier}")
-                    
-                except Exception as e:
-                    failed_updates.append({
-                        "identifier": identifier if 'identifier' in locals() else "unknown",
-                        "error": str(e)
-                    })
+                
+                logger.info(f"Updated tilt on {len(updated_cells)} cell(s)")
             
             return {
                 "updated_cells": updated_cells,
@@ -754,10 +956,10 @@ async def update_cell_endpoint(request: CellUpdateRequest):
         - updated_fields: List of changed fields
         - cell: Full updated cell configuration
     """
-    check_config_changes_allowed()
+    check_sim_initialized()
     
-    # Protect configuration modifications
-    async with config_lock:
+    # Protect configuration modifications (409 while compute is running)
+    async with config_update():
         try:
             result = update_cell_config(sim, request)
             result["status"] = "success"
@@ -797,10 +999,10 @@ async def update_cells_bulk_endpoint(request: BulkCellUpdateRequest):
         - results: Detailed results for each update
         - errors: List of errors (if any)
     """
-    check_config_changes_allowed()
+    check_sim_initialized()
     
-    # Protect configuration modifications
-    async with config_lock:
+    # Protect configuration modifications (409 while compute is running)
+    async with config_update():
         try:
             result = update_cells_bulk(sim, request)
             result["status"] = "success" if result["num_failed"] == 0 else "partial"
@@ -864,10 +1066,10 @@ async def update_cells_by_query_endpoint(request: QueryBasedUpdateRequest):
         - results: Detailed results per cell
         - errors: Any errors (if applicable)
     """
-    check_config_changes_allowed()
+    check_sim_initialized()
     
-    # Protect configuration modifications
-    async with config_lock:
+    # Protect configuration modifications (409 while compute is running)
+    async with config_update():
         try:
             result = update_cells_by_query(sim, request, query_cells)
             result["status"] = "success" if result["num_failed"] == 0 else "partial"
@@ -885,18 +1087,14 @@ async def reinitialize_simulation():
     
     Reinitialize the simulation with default configuration.
     """
-    # Check if compute is running
-    if compute_in_progress:
-        raise HTTPException(
-            status_code=409,
-            detail="Cannot reinitialize simulation while compute is in progress. Please wait for compute to complete."
-        )
+    logger.warning("POST /reinitialize is deprecated - use POST /initialize")
     
-    # Protect global simulation state during reinitialization
-    async with config_lock:
+    # Protect global simulation state during reinitialization (409 while compute is running)
+    async with config_update("reinitialize simulation"):
         try:
-            initialize_simulation()
-            return {"message": "Simulation reinitialized successfully (deprecated - use POST /initialize)", "status": "success"}
+            result = await _initialize_simulation_locked(SimInitializationRequest())
+            result["message"] = "Simulation reinitialized successfully (deprecated - use POST /initialize)"
+            return result
         except Exception as e:
             logger.error(f"Error reinitializing simulation: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Reinitialization failed: {str(e)}")
@@ -907,12 +1105,13 @@ async def get_sites():
     check_sim_initialized()
     
     # Protect config reads for consistency
-    async with config_lock:
-        return {
+    async with config_lock.reader:
+        body = _cached_payload(sim, "sites", lambda: {
             "sites": sim.sites_table(),
             "num_sites": len(sim.sites),
             "status": "success"
-        }
+        })
+        return Response(content=body, media_type="application/json")
 
 @app.get("/cells")
 async def get_cells():
@@ -920,12 +1119,13 @@ async def get_cells():
     check_sim_initialized()
     
     # Protect config reads for consistency
-    async with config_lock:
-        return {
+    async with config_lock.reader:
+        body = _cached_payload(sim, "cells", lambda: {
             "cells": sim.cells_table(),
             "num_cells": len(sim.cells),
             "status": "success"
-        }
+        })
+        return Response(content=body, media_type="application/json")
 
 @app.get("/ues")
 async def get_ues_endpoint():
@@ -941,7 +1141,7 @@ async def get_ues_endpoint():
     """
     check_sim_initialized()
     
-    async with config_lock:
+    async with config_lock.reader:
         try:
             ue_info = get_ue_info(sim)
             ue_info["status"] = "success"
@@ -968,9 +1168,9 @@ async def drop_ues_endpoint(request: UEDropRequest):
         height_m: UE height
         seed: Random seed
     """
-    check_config_changes_allowed()
+    check_sim_initialized()
     
-    async with config_lock:
+    async with config_update():
         try:
             result = drop_ues(sim, request)
             result["status"] = "success"
@@ -1019,15 +1219,71 @@ async def query_cells_endpoint(query: CellQuery):
     check_sim_initialized()
     
     # Protect config reads for consistency
-    async with config_lock:
+    async with config_lock.reader:
         try:
-            result = query_cells(sim, query)
+            result = await run_blocking(query_cells, sim, query)
             result["status"] = "success"
             return result
         except Exception as e:
             logger.error(f"Error in query-cells: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Query failed: {str(e)}")
 
+def _do_add_site(request: AddSiteRequest) -> Dict[str, Any]:
+    """Blocking body of /add-site; run off the event loop under config_lock.writer"""
+    # Next site number is tracked by the sim as sites are added/renamed
+    next_site_num = sim._next_site_num
+    site_name = f"SITE{next_site_num:04d}A"
+    
+    # Add the site
+    site_idx = sim.add_site(
+        x=request.x, 
+        y=request.y, 
+        height_m=request.height_m,
+        az0_deg=request.az0_deg,
+        name=site_name,
+        uid=site_name
+    )
+    
+    logger.debug("Added site %s at (%s, %s)", site_name, request.x, request.y)
+    
+    # Add cells if requested
+    cells_added = []
+    for cell_spec in (request.cells or []):
+        cell_idx = sim.add_cell(
+            site=site_name,
+            sector_id=cell_spec.sector_id,
+            band=cell_spec.band,
+            fc_hz=cell_spec.fc_hz,
+            tilt_deg=cell_spec.tilt_deg,
+            tx_rs_power_dbm=cell_spec.tx_rs_power_dbm,
+            bs_rows=cell_spec.bs_rows,
+            bs_cols=cell_spec.bs_cols,
+            bs_pol=cell_spec.bs_pol,
+            bs_pol_type=cell_spec.bs_pol_type,
+            elem_v_spacing=cell_spec.elem_v_spacing,
+            elem_h_spacing=cell_spec.elem_h_spacing,
+            antenna_pattern=cell_spec.antenna_pattern
+        )
+        cells_added.append({
+            "cell_idx": cell_idx,
+            "cell_name": sim.cells[cell_idx]['name'],
+            "band": cell_spec.band,
+            "sector_id": cell_spec.sector_id
+        })
+        logger.debug("Added cell %s to site %s", sim.cells[cell_idx]['name'], site_name)
+    
+    return {
+        "status": "success",
+        "site_idx": site_idx,
+        "site_name": site_name,
+        "site_number": next_site_num,
+        "position": {"x": request.x, "y": request.y},
+        "height_m": request.height_m,
+        "az0_deg": request.az0_deg,
+        "cells_added": cells_added,
+        "num_cells_added": len(cells_added)
+    }
+
 @app.post("/add-site")
 async def add_site_endpoint(request: AddSiteRequest):
     """
@@ -1067,71 +1323,14 @@ async def add_site_endpoint(request: AddSiteRequest):
             ]
         }
     """
-    check_config_changes_allowed()
+    check_sim_initialized()
     
-    async with config_lock:
+    async with config_update():
         try:
-            # Calculate next site number from existing sites
-            max_site_num = 0
-            for site in sim.sites:
-                # Parse existing site names like SITE0001A -> 0001
-                match = re.match(r'SITE(\d{4})A', site['name'])
-                if match:
-                    max_site_num = max(max_site_num, int(match.group(1)))
-            
-            next_site_num = max_site_num + 1
-            site_name = f"SITE{next_site_num:04d}A"
-            
-            # Add the site
-            site_idx = sim.add_site(
-                x=request.x, 
-                y=request.y, 
-                height_m=request.height_m,
-                az0_deg=request.az0_deg,
-                name=site_name,
-                uid=site_name
-            )
-            
-            logger.info(f"Added site {site_name} at ({request.x}, {request.y})")
-            
-            # Add cells if requested
-            cells_added = []
-            for cell_spec in (request.cells or []):
-                cell_idx = sim.add_cell(
-                    site=site_name,
-                    sector_id=cell_spec.sector_id,
-                    band=cell_spec.band,
-                    fc_hz=cell_spec.fc_hz,
-                    tilt_deg=cell_spec.tilt_deg,
-                    tx_rs_power_dbm=cell_spec.tx_rs_power_dbm,
-                    bs_rows=cell_spec.bs_rows,
-                    bs_cols=cell_spec.bs_cols,
-                    bs_pol=cell_spec.bs_pol,
-                    bs_pol_type=cell_spec.bs_pol_type,
-                    elem_v_spacing=cell_spec.elem_v_spacing,
-                    elem_h_spacing=cell_spec.elem_h_spacing,
-                    antenna_pattern=cell_spec.antenna_pattern
-                )
-                cells_added.append({
-                    "cell_idx": cell_idx,
-                    "cell_name": sim.cells[cell_idx]['name'],
-                    "band": cell_spec.band,
-                    "sector_id": cell_spec.sector_id
-                })
-                logger.info(f"Added cell {sim.cells[cell_idx]['name']} to site {site_name}")
-            
-            return {
-                "status": "success",
-                "site_idx": site_idx,
-                "site_name": site_name,
-                "site_number": next_site_num,
-                "position": {"x": request.x, "y": request.y},
-                "height_m": request.height_m,
-                "az0_deg": request.az0_deg,
-                "cells_added": cells_added,
-                "num_cells_added": len(cells_added)
-            }
-            
+            result = await run_blocking(_do_add_site, request)
+            logger.info("Added site %s at (%s, %s) with %d cells",
+                        result['site_name'], request.x, request.y, result['num_cells_added'])
+            return result
         except ValueError as e:
             # Catches duplicate name errors and validation errors
             logger.error(f"Validation error adding site: {str(e)}")
@@ -1141,6 +1340,89 @@ async def add_site_endpoint(request: AddSiteRequest):
             raise HTTPException(status_code=500, detail=f"Failed to add site: {str(e)}")
 
 
+def _do_add_cell(request: AddCellRequest) -> Dict[str, Any]:
+    """Body of /add-cell; caller holds config_lock.writer"""
+    # Verify site exists and get site info
+    site_idx = sim._site_idx_by_name.get(request.site_name)
+    
+    if site_idx is None:
+        raise HTTPException(
+            status_code=404, 
+            detail=f"Site '{request.site_name}' not found. Create site first with /add-site"
+        )
+    
+    site_info = sim.sites[site_idx]
+    
+    # Check if any cells already exist on this site/sector combination
+    existing_cells_on_sector = [
+        sim.cells[i]
+        for i in sim._cells_by_site_sector.get((site_idx, request.sector_id), ())
+    ]
+    
+    is_first_cell_on_sector = len(existing_cells_on_sector) == 0
+    
+    # Check for duplicate bands on same sector
+    existing_bands = [c['band'] for c in existing_cells_on_sector]
+    if request.band in existing_bands:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Band '{request.band}' already exists on {request.site_name} sector {request.sector_id}. Each band must be unique per sector. Existing bands: {', '.join(existing_bands)}"
+        )
+    
+    # Handle sector azimuth
+    if is_first_cell_on_sector:
+        # First cell on this sector - use provided azimuth or default
+        if request.sector_azimuth is not None:
+            sector_azimuth = request.sector_azimuth % 360.0
+            # Update the site's sector azimuth
+            sim.set_sector_az(request.site_name, request.sector_id, sector_azimuth)
+            logger.debug("Set sector %d azimuth to %s° for %s", request.sector_id, sector_azimuth, request.site_name)
+        else:
+            # Use existing azimuth from site definition
+            sector_azimuth = site_info['az_deg'][request.sector_id]
+    else:
+        # Not first cell - use existing sector azimuth, ignore any provided value
+        sector_azimuth = site_info['az_deg'][request.sector_id]
+        if request.sector_azimuth is not None and abs(request.sector_azimuth - sector_azimuth) > 0.01:
+            logger.warning("Ignoring sector_azimuth=%s° - sector %d already has azimuth %s°",
+                           request.sector_azimuth, request.sector_id, sector_azimuth)
+    
+    # Add the cell
+    cell_idx = sim.add_cell(
+        site=request.site_name,
+        sector_id=request.sector_id,
+        band=request.band,
+        fc_hz=request.fc_hz,
+        tilt_deg=request.tilt_deg,
+        tx_rs_power_dbm=request.tx_rs_power_dbm,
+        bs_rows=request.bs_rows,
+        bs_cols=request.bs_cols,
+        bs_pol=request.bs_pol,
+        bs_pol_type=request.bs_pol_type,
+        elem_v_spacing=request.elem_v_spacing,
+        elem_h_spacing=request.elem_h_spacing,
+        antenna_pattern=request.antenna_pattern
+    )
+    
+    cell_info = sim.get_cell(cell_idx)
+    
+    logger.debug("Added cell %s to site %s sector %d (azimuth: %s°)",
+                 cell_info['cell_name'], request.site_name, request.sector_id, sector_azimuth)
+    
+    return {
+        "status": "success",
+        "cell_idx": cell_idx,
+        "cell_name": cell_info['cell_name'],
+        "site_name": request.site_name,
+        "sector_id": request.sector_id,
+        "band": request.band,
+        "fc_hz": request.fc_hz,
+        "tilt_deg": request.tilt_deg,
+        "sector_azimuth": sector_azimuth,
+        "is_first_cell_on_sector": is_first_cell_on_sector,
+        "existing_bands_on_sector": existing_bands + [request.band]
+    }
+
 @app.post("/add-cell")
 async def add_cell_endpoint(request: AddCellRequest):
     """
@@ -1184,93 +1466,14 @@ async def add_cell_endpoint(request: AddCellRequest):
             "sector_azimuth": 45.0
         }
     """
-    check_config_changes_allowed()
+    check_sim_initialized()
     
-    async with config_lock:
+    async with config_update():
         try:
-            # Verify site exists and get site info
-            site_idx = None
-            site_info = None
-            for idx, s in enumerate(sim.sites):
-                if s['name'] == request.site_name:
-                    site_idx = idx
-                    site_info = s
-                    break
-            
-            if site_info is None:
-                raise HTTPException(
-                    status_code=404, 
-                    detail=f"Site '{request.site_name}' not found. Create site first with /add-site"
-                )
-            
-            # Check if any cells already exist on this site/sector combination
-            existing_cells_on_sector = [
-                c for c in sim.cells 
-                if c['site_id'] == site_idx and c['sector_id'] == request.sector_id
-            ]
-            
-            is_first_cell_on_sector = len(existing_cells_on_sector) == 0
-            
-            # Check for duplicate bands on same sector
-            existing_bands = [c['band'] for c in existing_cells_on_sector]
-            if request.band in existing_bands:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Band '{request.band}' already exists on {request.site_name} sector {request.sector_id}. Each band must be unique per sector. Existing bands: {', '.join(existing_bands)}"
-                )
-            
-            # Handle sector azimuth
-            if is_first_cell_on_sector:
-                # First cell on this sector - use provided azimuth or default
-                if request.sector_azimuth is not None:
-                    sector_azimuth = request.sector_azimuth % 360.0
-                    # Update the site's sector azimuth
-                    sim.set_sector_az(request.site_name, request.sector_id, sector_azimuth)
-                    logger.info(f"Set sector {request.sector_id} azimuth to {sector_azimuth}° for {request.site_name}")
-                else:
-                    # Use existing azimuth from site definition
-                    sector_azimuth = site_info['az_deg'][request.sector_id]
-            else:
-                # Not first cell - use existing sector azimuth, ignore any provided value
-                sector_azimuth = site_info['az_deg'][request.sector_id]
-                if request.sector_azimuth is not None and abs(request.sector_azimuth - sector_azimuth) > 0.01:
-                    logger.warning(f"Ignoring sector_azimuth={request.sector_azimuth}° - sector {request.sector_id} already has azimuth {sector_azimuth}°")
-            
-            # Add the cell
-            cell_idx = sim.add_cell(
-                site=request.site_name,
-                sector_id=request.sector_id,
-                band=request.band,
-                fc_hz=request.fc_hz,
-                tilt_deg=request.tilt_deg,
-                tx_rs_power_dbm=request.tx_rs_power_dbm,
-                bs_rows=request.bs_rows,
-                bs_cols=request.bs_cols,
-                bs_pol=request.bs_pol,
-                bs_pol_type=request.bs_pol_type,
-                elem_v_spacing=request.elem_v_spacing,
-                elem_h_spacing=request.elem_h_spacing,
-                antenna_pattern=request.antenna_pattern
-            )
-            
-            cell_info = sim.get_cell(cell_idx)
-            
-            logger.info(f"Added cell {cell_info['cell_name']} to site {request.site_name} sector {request.sector_id} (azimuth: {sector_azimuth}°)")
-            
-            return {
-                "status": "success",
-                "cell_idx": cell_idx,
-                "cell_name": cell_info['cell_name'],
-                "site_name": request.site_name,
-                "sector_id": request.sector_id,
-                "band": request.band,
-                "fc_hz": request.fc_hz,
-                "tilt_deg": request.tilt_deg,
-                "sector_azimuth": sector_azimuth,
-                "is_first_cell_on_sector": is_first_cell_on_sector,
-                "existing_bands_on_sector": existing_bands + [request.band]
-            }
-            
+            result = _do_add_cell(request)
+            logger.info("Added cell %s to site %s sector %d (azimuth: %s°)",
+                        result['cell_name'], request.site_name, request.sector_id, result['sector_azimuth'])
+            return result
         except ValueError as e:
             # Catches duplicate cell name errors and validation errors
             logger.error(f"Validation error adding cell: {str(e)}")
@@ -1281,5 +1484,79 @@ async def add_cell_endpoint(request: AddCellRequest):
             logger.error(f"Error adding cell: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Failed to add cell: {str(e)}")
 
+def _batch_error(index: int, e: Exception) -> Dict[str, Any]:
+    """Per-item error entry for the batch endpoints, using the single-item status codes"""
+    if isinstance(e, HTTPException):
+        status_code, detail = e.status_code, e.detail
+    elif isinstance(e, ValueError):
+        status_code, detail = 400, str(e)
+    else:
+        status_code, detail = 500, str(e)
+    return {"index": index, "status_code": status_code, "detail": detail}
+
+def _run_batch(items: List[Any], add_one, what: str) -> Dict[str, Any]:
+    """
+    Apply add_one to every item, collecting per-item results and errors.
+    A failing item doesn't abort the batch; items added before it stay added.
+    """
+    results = []
+    errors = []
+    for i, item in enumerate(items):
+        try:
+            results.append({"index": i, **add_one(item)})
+        except Exception as e:
+            errors.append(_batch_error(i, e))
+    logger.log(logging.WARNING if errors else logging.INFO,
+               "Batch add %s: %d added, %d failed", what, len(results), len(errors))
+    return {
+        "status": "success" if not errors else ("partial" if results else "failed"),
+        "num_added": len(results),
+        "num_failed": len(errors),
+        "results": results,
+        "errors": errors
+    }
+
+@app.post("/add-sites")
+async def add_sites_endpoint(request: AddSitesBatchRequest):
+    """
+    Add many sites (each with optional cells) in one request.
+    
+    Each entry is handled exactly like a POST /add-site body, under a single
+    config lock acquisition. Failures are reported per item in "errors"
+    (with the index into "sites") and don't abort the rest of the batch.
+    
+    Example:
+        POST /add-sites
+        {"sites": [{"x": 0.0, "y": 0.0}, {"x": 1000.0, "y": 500.0, "cells": [...]}]}
+    """
+    check_sim_initialized()
+    
+    async with config_update():
+        return await run_blocking(_run_batch, request.sites, _do_add_site, "sites")
+
+@app.post("/add-cells")
+async def add_cells_endpoint(request: AddCellsBatchRequest):
+    """
+    Add many cells to existing sites in one request.
+    
+    Each entry is handled exactly like a POST /add-cell body (same rules),
+    under a single config lock acquisition. Failures are reported per item
+    in "errors" (with the index into "cells") and don't abort the rest of
+    the batch.
+    
+    Example:
+        POST /add-cells
+        {
+            "cells": [
+                {"site_name": "SITE0001A", "sector_id": 0, "band": "H", "fc_hz": 2500000000},
+                {"site_name": "SITE0001A", "sector_id": 1, "band": "H", "fc_hz": 2500000000}
+            ]
+        }
+    """
+    check_sim_initialized()
+    
+    async with config_update():
+        return await run_blocking(_run_batch, request.cells, _do_add_cell, "cells")
+
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools")
\ No newline at end of file
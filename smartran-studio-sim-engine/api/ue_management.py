@@ -4,8 +4,8 @@ UE Management Module for CNS Sionna Simulation
 Provides UE query and drop/redrop capabilities.
 """
 
-from typing import Optional, Dict, Any
-from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any, Literal
+from pydantic import BaseModel, ConfigDict, Field
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,16 +18,17 @@ class UEDropRequest(BaseModel):
     WARNING: This REPLACES all existing UEs!
     """
     num_ue: int = Field(..., ge=1, description="Number of UEs to drop")
-    layout: str = Field("box", description="Layout type: 'disk' or 'box'")
+    layout: Literal["disk", "box"] = Field("box", description="Layout type: 'disk' or 'box'")
     center_x: Optional[float] = Field(None, description="Center X coordinate (defaults to site mean)")
     center_y: Optional[float] = Field(None, description="Center Y coordinate (defaults to site mean)")
     radius_m: float = Field(500.0, gt=0, description="Radius in meters (for disk layout)")
     box_pad_m: float = Field(500.0, gt=0, description="Padding around sites in meters (for box layout)")
     height_m: float = Field(1.5, gt=0, description="UE height in meters")
     seed: int = Field(7, description="Random seed for reproducibility")
+    shards: int = Field(1, ge=1, description="Threads for the drop; each draws from a child seed, so the drop depends on this value")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "examples": [
                 {
                     "num_ue": 30000,
@@ -46,12 +47,17 @@ class UEDropRequest(BaseModel):
                 }
             ]
         }
+    )
 
 
 def get_ue_info(sim) -> Dict[str, Any]:
     """
     Get information about the current UE drop.
     
+    The result is memoized on the sim and keyed by its UE-drop and compute
+    version counters, so repeated polls between drops/computes are a dict
+    copy instead of a rebuild.
+    
     Args:
         sim: MultiCellSim instance
         
@@ -63,7 +69,12 @@ def get_ue_info(sim) -> Dict[str, Any]:
             - has_results: Whether compute() has been run
             - results: (if has_results) Info about computed RSRP
     """
-    return sim.get_ue_info()
+    key = (sim._ue_version, sim._compute_version)
+    cached = sim._ue_info_cache
+    if cached is None or cached[0] != key:
+        cached = sim._ue_info_cache = (key, sim.get_ue_info())
+    # Shallow copy: callers add response fields (e.g. "status")
+    return dict(cached[1])
 
 
 def drop_ues(sim, request: UEDropRequest) -> Dict[str, Any]:
@@ -82,26 +93,22 @@ def drop_ues(sim, request: UEDropRequest) -> Dict[str, Any]:
             - num_ues: Number of UEs dropped
             - drop_params: Parameters used
             - message: Success message
-            
-    Raises:
-        ValueError: If layout is invalid
+    
+    Note:
+        request.layout is validated by UEDropRequest ('disk' or 'box').
         
     Example:
         >>> request = UEDropRequest(num_ue=50000, layout="box", box_pad_m=250.0)
         >>> result = drop_ues(sim, request)
         >>> print(f"Dropped {result['num_ues']} UEs")
     """
-    # Validate layout
-    if request.layout not in ['disk', 'box']:
-        raise ValueError(f"layout must be 'disk' or 'box', got '{request.layout}'")
-    
     # Build center parameter
     center = None
     if request.center_x is not None and request.center_y is not None:
         center = (request.center_x, request.center_y)
     
     # Drop UEs
-    logger.info(f"Dropping {request.num_ue} UEs with layout='{request.layout}'")
+    logger.info("Dropping %d UEs with layout='%s'", request.num_ue, request.layout)
     sim.drop_ues(
         num_ue=request.num_ue,
         layout=request.layout,
@@ -109,13 +116,14 @@ def drop_ues(sim, request: UEDropRequest) -> Dict[str, Any]:
         radius_m=request.radius_m,
         box_pad_m=request.box_pad_m,
         height_m=request.height_m,
-        seed=request.seed
+        seed=request.seed,
+        shards=request.shards
     )
     
     # Get updated info
-    ue_info = sim.get_ue_info()
+    ue_info = get_ue_info(sim)
     
-    logger.info(f"Successfully dropped {ue_info['num_ues']} UEs")
+    logger.info("Successfully dropped %d UEs", ue_info['num_ues'])
     
     return {
         "num_ues": ue_info['num_ues'],
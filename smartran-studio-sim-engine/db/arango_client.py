@@ -107,20 +107,20 @@ def init_arango(max_retries=10, retry_delay=2):
             # Create database if it doesn't exist
             if not sys_db.has_database(ARANGO_DATABASE):
                 sys_db.create_database(ARANGO_DATABASE)
-                logger.info(f"Created database: {ARANGO_DATABASE}")
+                logger.info("Created database: %s", ARANGO_DATABASE)
             
             # Connect to our database
             db = client.db(ARANGO_DATABASE, username=ARANGO_USERNAME, password=ARANGO_PASSWORD)
-            logger.info(f"Successfully connected to ArangoDB: {ARANGO_DATABASE}")
+            logger.info("Successfully connected to ArangoDB: %s", ARANGO_DATABASE)
             return db
             
         except Exception as e:
             if attempt < max_retries - 1:
-                logger.warning(f"Failed to connect to ArangoDB (attempt {attempt + 1}/{max_retries}): {e}")
-                logger.info(f"Retrying in {retry_delay} seconds...")
+                logger.warning("Failed to connect to ArangoDB (attempt %d/%d): %s", attempt + 1, max_retries, e)
+                logger.info("Retrying in %s seconds...", retry_delay)
                 time.sleep(retry_delay)
             else:
-                logger.error(f"Failed to connect to ArangoDB after {max_retries} attempts: {e}")
+                logger.error("Failed to connect to ArangoDB after %d attempts: %s", max_retries, e)
                 raise
     
     raise Exception("Failed to initialize ArangoDB connection")
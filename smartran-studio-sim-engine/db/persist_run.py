@@ -19,14 +19,22 @@ Data Model:
         - run_id: Link to parent run
         - user_id: UE identifier
         - x, y: UE coordinates
-        - readings: Dict of {cell_label: rsrp_dbm}
+        - readings: Dict of {cell_label: rsrp_dbm}, only non-null values
+          at or above the run's threshold_dbm
 
 Key Features:
     - Idempotent writes (safe to re-run same run_id)
     - Bulk insert for performance (thousands of UEs in milliseconds)
+    - orjson-encoded JSON-lines import (bypasses per-document driver overhead)
+    - Concurrent batch imports (document building overlaps HTTP round-trips)
     - Sparse storage (only cells above threshold)
     - Linked via run_id for efficient queries
 
+Environment Variables (optional):
+    ARANGO_RAW_IMPORT: Set to "0" to fall back to python-arango import_bulk
+        instead of the orjson raw import request (default: "1")
+    ARANGO_IMPORT_WORKERS: Max concurrent import requests per run (default: 4)
+
 Usage:
     >>> db = init_arango()
     >>> sim_runs = db.collection('sim_runs')
@@ -38,20 +46,44 @@ Author: Cognitive Network Solutions Inc.
 License: Apache 2.0
 """
 
-from datetime import datetime
-from typing import List, Dict, Any
+import os
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime, timezone
+from itertools import islice
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Union
+
+import numpy as np
+import orjson
+from arango.exceptions import DocumentInsertError
+from arango.request import Request
+
+# Number of per-UE documents sent to ArangoDB per import request
+REPORT_BATCH_SIZE = 5000
+
+# Use the orjson raw import path (set ARANGO_RAW_IMPORT=0 to use import_bulk)
+USE_RAW_IMPORT = os.getenv("ARANGO_RAW_IMPORT", "1") != "0"
 
+# Concurrent import requests per run. Keep at or below the HTTP connection
+# pool size of the python-arango client (requests default: 10).
+IMPORT_WORKERS = max(1, int(os.getenv("ARANGO_IMPORT_WORKERS", "4")))
 
-def _build_user_docs(run_id: str, ue_meas_reports: List[Dict[str, Any]]) -> list[dict]:
+
+def _build_user_docs(
+    run_id: str,
+    ue_meas_reports: Iterable[Dict[str, Any]],
+    threshold_dbm: float = float("-inf"),
+) -> Iterator[dict]:
     """
     Transform per-UE measurement reports into ArangoDB document format.
     
     Extracts user_id, coordinates (x,y), and RSRP readings into separate fields.
     Creates composite key "{run_id}:{user_id}" for efficient lookups.
+    Readings that are None, NaN or below threshold_dbm are dropped so stored
+    documents stay sparse even when callers pass full rows.
     
     Args:
         run_id: Simulation run identifier (timestamp-based)
-        ue_meas_reports: List of per-UE dicts with format:
+        ue_meas_reports: Iterable of per-UE dicts with format:
             {
                 "user_id": "user_000000",
                 "x": 123.45,
@@ -60,9 +92,10 @@ def _build_user_docs(run_id: str, ue_meas_reports: List[Dict[str, Any]]) -> list
                 "CELL_B": -92.7,
                 ...
             }
+        threshold_dbm: Minimum RSRP kept in readings (default: keep all)
     
-    Returns:
-        list: ArangoDB documents ready for bulk insert:
+    Yields:
+        dict: ArangoDB documents ready for bulk insert, one per UE:
             {
                 "_key": "2025-01-15_12-00-00:user_000000",
                 "run_id": "2025-01-15_12-00-00",
@@ -75,30 +108,239 @@ def _build_user_docs(run_id: str, ue_meas_reports: List[Dict[str, Any]]) -> list
     Note:
         The composite key enables efficient queries like "get all reports for run X"
         and "get report for specific UE in run X".
+        
+        Documents are produced lazily so that only one import batch is held in
+        memory alongside the source reports.
+        
+        Rows are sparse (each UE carries only its above-threshold cells), so the
+        reading keys differ per row. Coordinates are split off a C-level dict
+        copy; the threshold check also rejects NaN since NaN >= t is False.
     """
-    batch = []
+    key_prefix = f"{run_id}:"
     for row in ue_meas_reports:
-        user_id = row.get("user_id")
-        x = float(row.get("x", 0.0))
-        y = float(row.get("y", 0.0))
         # Separate coordinate fields from RSRP readings
-        readings = {k: v for k, v in row.items() if k not in ("user_id", "x", "y")}
-        batch.append({
-            "_key": f"{run_id}:{user_id}",
+        values = row.copy()
+        user_id = values.pop("user_id", None)
+        x = float(values.pop("x", 0.0))
+        y = float(values.pop("y", 0.0))
+        readings = {k: v for k, v in values.items() if v is not None and v >= threshold_dbm}
+        yield {
+            "_key": key_prefix + str(user_id),
+            "run_id": run_id,
+            "user_id": user_id,
+            "x": x,
+            "y": y,
+            "readings": readings,
+        }
+
+
+def _build_user_docs_df(run_id: str, df, threshold_dbm: float = float("-inf")) -> Iterator[dict]:
+    """
+    Transform a per-UE measurement DataFrame into ArangoDB document format.
+    
+    Column-wise equivalent of _build_user_docs for reports that are already
+    tabular (one row per UE, one column per cell label plus user_id/x/y).
+    Coordinates and user IDs are extracted as whole NumPy columns, and the
+    threshold/NaN filter runs once over the reading block as a NumPy mask;
+    per-UE readings are then sliced out of the flattened kept values, so no
+    per-cell comparisons or float() casts run in Python.
+    
+    Args:
+        run_id: Simulation run identifier (timestamp-based)
+        df: pandas DataFrame with a "user_id" column, optional "x"/"y"
+            columns, and one column per cell label holding RSRP in dBm
+            (NaN/None for cells not reported)
+        threshold_dbm: Minimum RSRP kept in readings (default: keep all)
+    
+    Yields:
+        dict: ArangoDB documents in the same format as _build_user_docs
+    """
+    n = len(df)
+    key_prefix = f"{run_id}:"
+    user_ids = df["user_id"].to_numpy().tolist()
+    xs = df["x"].to_numpy(np.float64).tolist() if "x" in df.columns else [0.0] * n
+    ys = df["y"].to_numpy(np.float64).tolist() if "y" in df.columns else [0.0] * n
+    reading_cols = df.columns.difference(["user_id", "x", "y"], sort=False)
+    labels = reading_cols.tolist()
+
+    # Mask once (NaN compares False), then locate each UE's kept cells
+    values = df[reading_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+    rows, cols = np.nonzero(values >= threshold_dbm)
+    kept = values[rows, cols].tolist()
+    cols = cols.tolist()
+    bounds = np.searchsorted(rows, np.arange(n + 1)).tolist()
+
+    for u, (user_id, x, y) in enumerate(zip(user_ids, xs, ys)):
+        s, e = bounds[u], bounds[u + 1]
+        readings = {labels[c]: v for c, v in zip(cols[s:e], kept[s:e])}
+        yield {
+            "_key": key_prefix + str(user_id),
             "run_id": run_id,
             "user_id": user_id,
             "x": x,
             "y": y,
             "readings": readings,
-        })
-    return batch
+        }
+
+
+def _is_dataframe(obj) -> bool:
+    """Return True if obj is a pandas DataFrame (pandas imported lazily)."""
+    try:
+        import pandas as pd
+    except ImportError:
+        return False
+    return isinstance(obj, pd.DataFrame)
+
+
+def cursor_full_count(cursor) -> int:
+    """
+    Number of matches before LIMIT for a cursor opened with full_count=True.
+    
+    python-arango keeps the server's camelCase key for this statistic.
+    """
+    return cursor.statistics()["fullCount"]
+
+
+def _iter_batches(docs: Iterable[dict], batch_size: int = REPORT_BATCH_SIZE) -> Iterator[list]:
+    """
+    Group an iterable of documents into lists of at most batch_size items.
+    
+    Args:
+        docs: Iterable of ArangoDB documents
+        batch_size: Maximum number of documents per batch
+    
+    Yields:
+        list: Next batch of documents (never empty)
+    """
+    it = iter(docs)
+    while True:
+        batch = list(islice(it, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _import_raw(collection, batch: list) -> dict:
+    """
+    Bulk import documents via a single raw /_api/import request.
+    
+    Serializes the batch as JSON lines with orjson and posts it through the
+    collection's existing python-arango connection (same host, credentials
+    and HTTP session). Equivalent to import_bulk(batch, on_duplicate="update")
+    but skips the driver's per-document Python processing and stdlib json.
+    
+    Args:
+        collection: ArangoDB collection handle to import into
+        batch: List of documents (each with a _key)
+    
+    Returns:
+        dict: Import result ({"created": ..., "updated": ..., "errors": ...})
+    
+    Raises:
+        DocumentInsertError: If the server rejects the import
+    """
+    payload = b"\n".join(orjson.dumps(doc, option=orjson.OPT_SERIALIZE_NUMPY) for doc in batch)
+    request = Request(
+        method="post",
+        endpoint="/_api/import",
+        params={
+            "collection": collection.name,
+            "type": "documents",
+            "onDuplicate": "update",
+            "complete": True,
+        },
+        data=payload.decode("utf-8"),
+        write=collection.name,
+    )
+    resp = collection.conn.send_request(request)
+    if not resp.is_success:
+        raise DocumentInsertError(resp, request)
+    return resp.body
+
+
+def _import_batch(sim_reports, batch: list) -> None:
+    """Import one batch of report documents using the configured path."""
+    # on_duplicate="update" lets you safely re-run same run_id
+    if USE_RAW_IMPORT:
+        _import_raw(sim_reports, batch)
+    else:
+        sim_reports.import_bulk(batch, on_duplicate="update")
+
+
+def _write_run(
+    sim_runs,
+    sim_reports,
+    run_id: str,
+    num_reports: Optional[int],
+    docs: Iterable[dict],
+    metadata: Dict[str, Any],
+    threshold_dbm: float,
+    label_mode: str,
+) -> None:
+    """
+    Write the run header and stream the per-UE documents in batches.
+    
+    Shared by persist_run and persist_run_df once the report documents
+    have been built from their respective input formats.
+    
+    Batches are imported concurrently on up to IMPORT_WORKERS threads while
+    the next batch is being built. At most IMPORT_WORKERS batches are in
+    flight at once, so memory stays bounded regardless of the number of UEs.
+    The run header upsert is issued on the same pool alongside the first
+    batches, so it does not add a sequential round-trip before the reports.
+    
+    If num_reports is None (reports supplied by a generator), documents are
+    counted as they stream and the header is written once all batches are in.
+    """
+    # UTC creation time, e.g. "2025-01-15T12:00:00.123Z"
+    created_at = datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+    header = {
+        "_key": run_id,
+        "created_at": created_at,
+        "threshold_dbm": float(threshold_dbm),
+        "label_mode": label_mode,
+        "num_reports": num_reports,
+        "metadata": metadata,
+    }
+
+    if num_reports == 0:
+        sim_runs.insert(header, overwrite=True)
+        return
+
+    # Bulk insert/update per-user docs, streamed in fixed-size batches
+    if num_reports is None:
+        workers = IMPORT_WORKERS
+    else:
+        workers = min(IMPORT_WORKERS, -(-num_reports // REPORT_BATCH_SIZE))
+
+    # One extra thread for the run header
+    with ThreadPoolExecutor(max_workers=workers + 1, thread_name_prefix="arango-import") as pool:
+        # Upsert run header (overwrite=True keeps re-runs idempotent)
+        header_fut = None
+        if num_reports is not None:
+            header_fut = pool.submit(sim_runs.insert, header, overwrite=True)
+        pending = set()
+        count = 0
+        for batch in _iter_batches(docs):
+            if len(pending) >= workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    fut.result()  # surface import errors early
+            pending.add(pool.submit(_import_batch, sim_reports, batch))
+            count += len(batch)
+        for fut in pending:
+            fut.result()
+        if header_fut is None:
+            header["num_reports"] = count
+            header_fut = pool.submit(sim_runs.insert, header, overwrite=True)
+        header_fut.result()
 
 
 def persist_run(
     sim_runs,                 # arango.collection handle
     sim_reports,              # arango.collection handle
     run_id: str,
-    ue_meas_reports: List[Dict[str, Any]],
+    ue_meas_reports: Union[List[Dict[str, Any]], Iterable[Dict[str, Any]]],
     metadata: Dict[str, Any],
     threshold_dbm: float,
     label_mode: str,
@@ -117,12 +359,16 @@ def persist_run(
         sim_runs: ArangoDB collection handle for run headers
         sim_reports: ArangoDB collection handle for UE reports
         run_id: Unique run identifier (e.g., "2025-01-15_12-00-00")
-        ue_meas_reports: List of per-UE measurement dicts
+        ue_meas_reports: List (or generator) of per-UE measurement dicts,
+            or a pandas DataFrame with the same columns (routed to
+            persist_run_df). Generators are consumed in batches, so only
+            the in-flight batches are held in memory.
         metadata: Run metadata dict containing:
             - init_config: Initial simulation parameters
             - cell_states_at_run: Cell configurations when run executed
             - num_users, num_bands, bands, etc.
-        threshold_dbm: RSRP threshold used for filtering
+        threshold_dbm: RSRP threshold; readings below it (or None/NaN) are
+            not stored
         label_mode: Cell labeling format ("name" or "bxy")
     
     Returns:
@@ -140,7 +386,7 @@ def persist_run(
     
     Performance:
         - Run header: Single upsert (< 1ms)
-        - UE reports: Bulk insert (30k docs in ~100ms)
+        - UE reports: Bulk insert in batches of REPORT_BATCH_SIZE (30k docs in ~100ms)
         - Total: Typically < 200ms for 30k UEs
     
     Storage:
@@ -156,18 +402,45 @@ def persist_run(
         
         This enables safe retry logic and re-computation scenarios.
     """
-    # Upsert run header
-    sim_runs.insert({
-        "_key": run_id,
-        "created_at": datetime.utcnow().isoformat() + "Z",
-        "threshold_dbm": float(threshold_dbm),
-        "label_mode": label_mode,
-        "num_reports": len(ue_meas_reports),
-        "metadata": metadata,
-    }, overwrite=True)
+    if _is_dataframe(ue_meas_reports):
+        persist_run_df(sim_runs, sim_reports, run_id, ue_meas_reports,
+                       metadata, threshold_dbm, label_mode)
+        return
+
+    num_reports = len(ue_meas_reports) if hasattr(ue_meas_reports, "__len__") else None
+    _write_run(sim_runs, sim_reports, run_id, num_reports,
+               _build_user_docs(run_id, ue_meas_reports, threshold_dbm),
+               metadata, threshold_dbm, label_mode)
 
-    # Bulk insert/update per-user docs
-    batch = _build_user_docs(run_id, ue_meas_reports)
-    if batch:
-        # on_duplicate="update" lets you safely re-run same run_id
-        sim_reports.import_bulk(batch, on_duplicate="update")
\ No newline at end of file
+
+def persist_run_df(
+    sim_runs,                 # arango.collection handle
+    sim_reports,              # arango.collection handle
+    run_id: str,
+    df,                       # pandas.DataFrame, one row per UE
+    metadata: Dict[str, Any],
+    threshold_dbm: float,
+    label_mode: str,
+) -> None:
+    """
+    Persist a run whose per-UE reports are held in a pandas DataFrame.
+    
+    Same storage layout and idempotency as persist_run, but documents are
+    assembled column-wise (see _build_user_docs_df) instead of converting
+    the table to a list of dicts and re-scanning every row.
+    
+    Args:
+        sim_runs: ArangoDB collection handle for run headers
+        sim_reports: ArangoDB collection handle for UE reports
+        run_id: Unique run identifier (e.g., "2025-01-15_12-00-00")
+        df: DataFrame with "user_id", "x", "y" and one column per cell label
+        metadata: Run metadata dict (see persist_run)
+        threshold_dbm: RSRP threshold used for filtering
+        label_mode: Cell labeling format ("name" or "bxy")
+    
+    Returns:
+        None
+    """
+    _write_run(sim_runs, sim_reports, run_id, len(df),
+               _build_user_docs_df(run_id, df, threshold_dbm),
+               metadata, threshold_dbm, label_mode)
@@ -69,7 +69,10 @@ tf.get_logger().setLevel('ERROR')
 import numpy as np
 import matplotlib.pyplot as plt
 import time
+import functools
 import datetime
+import re
+from concurrent.futures import ThreadPoolExecutor
 from sionna.phy.channel.tr38901 import PanelArray, UMa
 from sionna.phy.ofdm import ResourceGrid
 from sionna.phy.channel import OFDMChannel
@@ -95,6 +98,42 @@ def _ypr_from_deg(az_deg, tilt_deg=0.0, roll_deg=0.0):
     roll  = np.deg2rad(roll_deg).astype(np.float32)
     return np.array([yaw, pitch, roll], dtype=np.float32)
 
+_SITE_NUM_RE = re.compile(r'SITE(\d{4})A')   # API site naming: SITE0001A
+
+@functools.lru_cache(maxsize=32)
+def _panel_array(fc, rows, cols, pol, pol_type, elem_v_spacing, elem_h_spacing, antenna_pattern):
+    """
+    Build (or reuse) a PanelArray for one antenna configuration.
+    Arrays are read-only once built, so every compute() and every sim with the
+    same (fc, geometry, pattern) shares one instance instead of rebuilding the
+    element positions and pattern per group per run.
+    """
+    return PanelArray(
+        num_rows_per_panel=rows,
+        num_cols_per_panel=cols,
+        polarization=pol,
+        polarization_type=pol_type if pol == 'dual' else 'V',
+        antenna_pattern=antenna_pattern,
+        carrier_frequency=fc,
+        element_vertical_spacing=elem_v_spacing,
+        element_horizontal_spacing=elem_h_spacing,
+    )
+
+def _bumps_config_version(method):
+    """
+    Mark a MultiCellSim method as a site/cell config mutator.
+    The config version is bumped after the method body (even if it raises
+    part-way), so a cache rebuilt while the mutation is still running is
+    keyed to the old version and gets rebuilt again afterwards.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._config_version += 1
+    return wrapper
+
 def _trisector_azimuths(az0_deg):
     """
     Calculate 3-sector azimuth angles from sector-0 azimuth.
@@ -146,15 +185,41 @@ class MultiCellSim:
 
         # UEs
         self.ue_loc = None; self.ue_orient = None; self.ue_vel = None; self.in_state = None
+        self._ue_xy = None        # [U, 2] contiguous x,y of ue_loc[0], refreshed on drop
+        self.ue_drop_params = None
+
+        # Compute chunk sizes (None/0 = no chunking) and the config this sim was built from
+        self.cells_chunk = None
+        self.ue_chunk = None
+        self.init_config = {}
+        self.init_config_summary = {}
+        self._timestep_counter = 0
 
         # Results
         self.cells_index = []
         self.RSRP_dBm = None      # [U, C]
         self.best_cell = None     # [U]
         self.best_sector = None   # [U] (site*3 + sector_id)
+
+        # Version counters for derived-state caches (bumped on UE drop / compute / site & cell edits)
+        self._ue_version = 0
+        self._compute_version = 0
+        self._config_version = 0
+        self._ue_info_cache = None       # (versions, get_ue_info() result)
+        self._cells_table_cache = None   # (config version, unfiltered cells_table rows)
+        self._cells_frame_cache = None   # (config version, cells_frame() DataFrame)
+        self._bands_cache = None         # (config version, bands list for get_metadata)
+        self._site_idx_by_name = {}      # {site name: site index}
+        self._cell_idx_by_name = {}      # {cell name: cell index}
+        self._cells_by_site_sector = {}  # {(site index, sector id): [cell indices]}
+        self._next_site_num = 1          # next free N for API site names SITE{N:04d}A
+        self._status_snapshot = None # (versions, /status fields), rebuilt lazily by the API
+        self._payload_cache = {}     # {name: (config version, encoded JSON body)}, used by the API
+        self._labels_cache = {}      # {(label mode, suffix flag): (config version, report labels)}
         self.naming = dict(use_site='id', sector_mode='1based', pattern='{band}{site}{sector}')
 
     # ---------- sites & sectors ----------
+    @_bumps_config_version
     def add_site(self, x, y, height_m=25.0, az0_deg=0.0, name=None, uid=None):
         """
         Create a site with 3 sectors.
@@ -179,7 +244,7 @@ class MultiCellSim:
         uid  = str(uid)
     
         # Enforce uniqueness
-        if any(s.get('name') == name for s in self.sites):
+        if name in self._site_idx_by_name:
             raise ValueError(f"Duplicate site name '{name}'. Site names must be unique.")
         if any(str(s.get('id')) == uid for s in self.sites):
             raise ValueError(f"Duplicate site uid '{uid}'. Site uids must be unique.")
@@ -191,12 +256,22 @@ class MultiCellSim:
             x=float(x), y=float(y), height=float(height_m),
             az_deg=_trisector_azimuths(az0_deg)  # [az0, az0+120, az0+240]
         ))
+        self._site_idx_by_name[name] = idx
+        self._note_site_num(name)
         return idx
 
+    def _note_site_num(self, name):
+        """Keep _next_site_num past any SITE{N:04d}A name seen on add/rename."""
+        m = _SITE_NUM_RE.match(name)
+        if m:
+            self._next_site_num = max(self._next_site_num, int(m.group(1)) + 1)
+
+    @_bumps_config_version
     def set_sector_az(self, site, sector_id, az_deg):
         i = self._site_idx(site)
         self.sites[i]['az_deg'][sector_id] = float(az_deg) % 360.0
 
+    @_bumps_config_version
     def set_site_height(self, site, height_m):
         i = self._site_idx(site)
         self.sites[i]['height'] = float(height_m)
@@ -206,6 +281,7 @@ class MultiCellSim:
 
     
     # ---------- cells (per-carrier, per-sector) ----------
+    @_bumps_config_version
     def add_cell(self, site, sector_id, *, band: str, fc_hz,
              tx_rs_power_dbm=0.0, tilt_deg=None, roll_deg=0.0, height_m=None, 
              bs_rows=None, bs_cols=None, bs_pol=None, bs_pol_type=None,
@@ -227,7 +303,7 @@ class MultiCellSim:
         auto = self.make_cell_code(i, int(sector_id), band) if name is None else str(name)
         
         # Enforce cell name uniqueness
-        if any(c.get('name') == auto for c in self.cells):
+        if auto in self._cell_idx_by_name:
             raise ValueError(f"Duplicate cell name '{auto}'. Cell names must be unique. "
                            f"This usually means you're adding the same band to the same sector at the same site.")
     
@@ -252,14 +328,19 @@ class MultiCellSim:
             name=auto,
         )
         self.cells.append(cell)
-        return len(self.cells) - 1
+        idx = len(self.cells) - 1
+        self._cell_idx_by_name[auto] = idx
+        self._cells_by_site_sector.setdefault((cell['site_id'], cell['sector_id']), []).append(idx)
+        return idx
 
+    @_bumps_config_version
     def update_cell(self, cell_id, *, site=None, sector_id=None, band=None,
                 fc_hz=None, tx_rs_power_dbm=None, tilt_deg=None, roll_deg=None,
                 height_m=None, bs_rows=None, bs_cols=None, bs_pol=None, bs_pol_type=None,
                 elem_v_spacing=None, elem_h_spacing=None, antenna_pattern=None,
                 rename: bool=True):
         c = self.cells[cell_id]
+        old_key = (c['site_id'], c['sector_id'])
         moved = False
         if site is not None:
             c['site_id'] = int(self._site_idx(site)); moved = True
@@ -292,13 +373,39 @@ class MultiCellSim:
             c['elem_h_spacing'] = float(elem_h_spacing)
         if antenna_pattern is not None:
             c['antenna_pattern'] = str(antenna_pattern)
+        new_key = (c['site_id'], c['sector_id'])
+        if new_key != old_key:
+            self._cells_by_site_sector[old_key].remove(cell_id)
+            bucket = self._cells_by_site_sector.setdefault(new_key, [])
+            bucket.append(cell_id)
+            bucket.sort()
         if rename and moved:
             new_name = self.make_cell_code(c['site_id'], c['sector_id'], c['band'])
             # Check for name collision before renaming
-            if any(i != cell_id and other_c.get('name') == new_name for i, other_c in enumerate(self.cells)):
+            if self._cell_idx_by_name.get(new_name, cell_id) != cell_id:
                 raise ValueError(f"Cannot rename cell {cell_id}: name '{new_name}' already exists. Cell names must be unique.")
+            del self._cell_idx_by_name[c['name']]
             c['name'] = new_name
+            self._cell_idx_by_name[new_name] = cell_id
+
+    @_bumps_config_version
+    def update_cells(self, cell_ids, tilt_deg):
+        """
+        Set tilt on many cells in one call.
+        cell_ids and tilt_deg are aligned 1-D sequences; all ids are validated
+        before any cell is touched, so a bad id leaves the config unchanged.
+        """
+        ids = np.asarray(cell_ids, dtype=np.int64).ravel()
+        tilts = np.asarray(tilt_deg, dtype=np.float64).ravel()
+        if ids.shape != tilts.shape:
+            raise ValueError(f"cell_ids and tilt_deg length mismatch: {ids.size} vs {tilts.size}")
+        if ids.size and (ids.min() < 0 or ids.max() >= len(self.cells)):
+            raise IndexError(f"Cell ID out of range (0-{len(self.cells)-1})")
+        cells = self.cells
+        for i, t in zip(ids.tolist(), tilts.tolist()):
+            cells[i]['tilt_deg'] = t
 
+    @_bumps_config_version
     def rename_site(self, site, *, name=None, uid=None):
         """
         Rename/re-id a site. Enforces uniqueness across all sites.
@@ -307,9 +414,12 @@ class MultiCellSim:
         i = self._site_idx(site)
         if name is not None:
             name = str(name)
-            if any(j != i and s.get('name') == name for j, s in enumerate(self.sites)):
+            if self._site_idx_by_name.get(name, i) != i:
                 raise ValueError(f"Duplicate site name '{name}'.")
+            del self._site_idx_by_name[self.sites[i]['name']]
             self.sites[i]['name'] = name
+            self._site_idx_by_name[name] = i
+            self._note_site_num(name)
         if uid is not None:
             uid = str(uid)
             if any(j != i and str(s.get('id')) == uid for j, s in enumerate(self.sites)):
@@ -325,10 +435,10 @@ class MultiCellSim:
 
     def sites_table(self, as_dataframe: bool = False):
         rows = []
-        # count cells per site
+        # count cells per site (from the site/sector index)
         counts = {}
-        for c in self.cells:
-            counts[c['site_id']] = counts.get(c['site_id'], 0) + 1
+        for (site_id, _), cell_ids in self._cells_by_site_sector.items():
+            counts[site_id] = counts.get(site_id, 0) + len(cell_ids)
         for i, s in enumerate(self.sites):
             rows.append(dict(
                 idx=i,
@@ -346,8 +456,11 @@ class MultiCellSim:
                 pass
         return rows        
 
+    @_bumps_config_version
     def clear_cells(self):
         self.cells = []
+        self._cell_idx_by_name = {}
+        self._cells_by_site_sector = {}
 
     def list_cells(self):
         for i, c in enumerate(self.cells):
@@ -360,7 +473,8 @@ class MultiCellSim:
                   f"array={c['bs_rows']}x{c['bs_cols']} {c['bs_pol']} {c['antenna_pattern']}")
 
     # ---------- UEs ----------
-    def drop_ues(self, num_ue, layout='disk', center=None, radius_m=500.0, box_pad_m=500.0, height_m=1.5, seed=7):
+    def drop_ues(self, num_ue, layout='disk', center=None, radius_m=500.0, box_pad_m=500.0, height_m=1.5, seed=7,
+                 shards=1):
         """
         Drop UEs in the simulation area. This REPLACES any existing UEs.
         
@@ -372,28 +486,43 @@ class MultiCellSim:
             box_pad_m: Padding around sites for box layout
             height_m: UE height
             seed: Random seed for reproducibility
+            shards: Draw the positions in this many threads, each from its own child
+                    SeedSequence of `seed`. The drop is reproducible for a fixed
+                    (seed, shards) pair; shards=1 keeps the single-stream draw.
         """
         num_ue = int(num_ue)
-        rng = np.random.default_rng(seed)
+        shards = max(1, min(int(shards), num_ue))
         if center is None and len(self.sites):
             cx = float(np.mean([s['x'] for s in self.sites])); cy = float(np.mean([s['y'] for s in self.sites]))
         else:
             cx, cy = (0.0, 0.0) if center is None else (float(center[0]), float(center[1]))
 
         if layout == 'disk':
-            r = radius_m * np.sqrt(rng.random(num_ue))
-            ph = 2*np.pi * rng.random(num_ue)
-            xs = cx + r*np.cos(ph); ys = cy + r*np.sin(ph)
             minx, maxx, miny, maxy = None, None, None, None
+            def draw(rng, n):
+                r = radius_m * np.sqrt(rng.random(n))
+                ph = 2*np.pi * rng.random(n)
+                return cx + r*np.cos(ph), cy + r*np.sin(ph)
         else:
             xs_sites = [s['x'] for s in self.sites] or [0.0]
             ys_sites = [s['y'] for s in self.sites] or [0.0]
             minx, maxx = min(xs_sites)-box_pad_m, max(xs_sites)+box_pad_m
             miny, maxy = min(ys_sites)-box_pad_m, max(ys_sites)+box_pad_m
-            xs = rng.uniform(minx, maxx, size=num_ue); ys = rng.uniform(miny, maxy, size=num_ue)
+            def draw(rng, n):
+                return rng.uniform(minx, maxx, size=n), rng.uniform(miny, maxy, size=n)
+
+        if shards == 1:
+            xs, ys = draw(np.random.default_rng(seed), num_ue)
+        else:
+            children = np.random.SeedSequence(seed).spawn(shards)
+            sizes = [len(a) for a in np.array_split(np.arange(num_ue), shards)]
+            with ThreadPoolExecutor(max_workers=shards) as ex:
+                parts = list(ex.map(lambda cs, n: draw(np.random.Generator(np.random.PCG64(cs)), n), children, sizes))
+            xs = np.concatenate([p[0] for p in parts]); ys = np.concatenate([p[1] for p in parts])
 
         zs = np.full(num_ue, float(height_m), np.float32)
         self.ue_loc = np.stack([xs.astype(np.float32), ys.astype(np.float32), zs], axis=1)[None, ...]
+        self._ue_xy = np.ascontiguousarray(self.ue_loc[0][:, :2])
         self.ue_orient = np.tile(np.array([np.pi, 0.0, 0.0], np.float32), (num_ue,1))[None, ...]
         self.ue_vel = np.zeros_like(self.ue_loc)
         self.in_state = np.zeros((1, num_ue), dtype=bool)
@@ -407,8 +536,10 @@ class MultiCellSim:
             box_pad_m=float(box_pad_m) if layout == 'box' else None,
             box_bounds=(minx, maxx, miny, maxy) if layout == 'box' else None,
             height_m=float(height_m),
-            seed=seed
+            seed=seed,
+            shards=shards
         )
+        self._ue_version += 1
     
     def get_ue_info(self):
         """
@@ -434,8 +565,8 @@ class MultiCellSim:
         
         result = {
             "num_ues": num_ues,
-            "layout": self.ue_drop_params.get('layout') if hasattr(self, 'ue_drop_params') else None,
-            "drop_params": self.ue_drop_params if hasattr(self, 'ue_drop_params') else None,
+            "layout": self.ue_drop_params.get('layout') if self.ue_drop_params is not None else None,
+            "drop_params": self.ue_drop_params,
             "has_results": has_results,
         }
         
@@ -547,7 +678,7 @@ class MultiCellSim:
         index_meta = [None] * C_total
     
         # chunk sizes
-        ue_step = int(getattr(self, "ue_chunk", 0) or U)
+        ue_step = int(self.ue_chunk or U)
         # helper to chunk a list
         def _chunks(lst, k):
             if not k: yield lst
@@ -560,22 +691,11 @@ class MultiCellSim:
             # Unpack antenna config from key
             fc, bs_rows, bs_cols, bs_pol, bs_pol_type, elem_v_spacing, elem_h_spacing, antenna_pattern = array_key
             
-            # Build arrays ONCE per (frequency + antenna config) group
-            bs_array = PanelArray(
-                num_rows_per_panel=int(bs_rows),
-                num_cols_per_panel=int(bs_cols),
-                polarization=str(bs_pol),
-                polarization_type=str(bs_pol_type) if str(bs_pol)=='dual' else 'V',
-                antenna_pattern=str(antenna_pattern),
-                carrier_frequency=float(fc),
-                element_vertical_spacing=float(elem_v_spacing),
-                element_horizontal_spacing=float(elem_h_spacing),
-            )
-            ue_array = PanelArray(
-                num_rows_per_panel=1, num_cols_per_panel=1,
-                polarization=self.arr_cfg['ue_pol'], polarization_type='V',
-                antenna_pattern='omni', carrier_frequency=float(fc),
-            )
+            # Arrays are shared per (frequency + antenna config), across groups and runs
+            bs_array = _panel_array(float(fc), int(bs_rows), int(bs_cols), str(bs_pol), str(bs_pol_type),
+                                    float(elem_v_spacing), float(elem_h_spacing), str(antenna_pattern))
+            ue_array = _panel_array(float(fc), 1, 1, str(self.arr_cfg['ue_pol']), 'V',
+                                    None, None, 'omni')
             ch = UMa(carrier_frequency=float(fc), o2i_model='low',
                      ut_array=ue_array, bs_array=bs_array,
                      direction='downlink',
@@ -583,7 +703,7 @@ class MultiCellSim:
     
             base_col = col  # remember where this carrier's columns start
     
-            for sub_cells in _chunks(cell_list, int(getattr(self, "cells_chunk", 0) or 0)):
+            for sub_cells in _chunks(cell_list, int(self.cells_chunk or 0)):
                 # Geometry for these sub-cells
                 bs_loc, bs_orient, _ = self._build_geom_for_cells(sub_cells)
                 Bf = bs_loc.shape[1]
@@ -594,6 +714,10 @@ class MultiCellSim:
                                   num_tx=Bf, num_streams_per_tx=1)
                 ofdm_ch = OFDMChannel(channel_model=ch, resource_grid=rg, return_channel=True)
     
+                # RS power per sub-cell column, used to scale the gains below
+                P_rs_W = self._dbm_to_watt(np.array([cell['tx_rs_power_dbm'] for _, cell in sub_cells],
+                                                    dtype=np.float64))  # [Bf]
+    
                 # Fill column metas (once)
                 for j, (_, cell) in enumerate(sub_cells):
                     index_meta[base_col + j] = dict(
@@ -626,11 +750,8 @@ class MultiCellSim:
                     G  = tf.reduce_mean(tf.reduce_sum(H2, axis=[2,4]), axis=[-1,-2])  # [1,u_sub,Bf]
                     G  = tf.squeeze(G, 0).numpy()                                     # [u_sub,Bf]
     
-                    # Write this UE-slice into the right columns
-                    for j, (_, cell) in enumerate(sub_cells):
-                        P_rs_W = self._dbm_to_watt(cell['tx_rs_power_dbm'])
-                        RSRP_W = P_rs_W * G[:, j]
-                        R_full[u0:u1, base_col + j] = self._watt_to_dbm(RSRP_W)
+                    # Write this UE-slice into the right columns in one block op
+                    R_full[u0:u1, base_col:base_col + Bf] = self._watt_to_dbm(G * P_rs_W)
     
                     # free references ASAP
                     del H, H2, G, x
@@ -642,6 +763,7 @@ class MultiCellSim:
     
         self.RSRP_dBm = R_full
         self.cells_index = index_meta
+        self._compute_version += 1
         return self.RSRP_dBm, self.cells_index
 
     # ---------- plots ----------
@@ -725,6 +847,10 @@ class MultiCellSim:
             "antenna_pattern": str(c["antenna_pattern"]),
         }
     
+    def get_cells(self, cell_ids):
+        """Return get_cell() dicts for a sequence of cell indices."""
+        return [self.get_cell(i) for i in np.asarray(cell_ids, dtype=np.int64).ravel().tolist()]
+    
     def cells_table(self, where: dict | None = None, as_dataframe: bool = False):
         """
         Returns a per-cell table keyed by NAMES (not numeric site_id).
@@ -742,38 +868,49 @@ class MultiCellSim:
     
         Filtering (optional): pass a dict where keys are any column name above (or
         'fc_mhz' / 'fc_ghz' aliases) and values are equality, (min,max) ranges, or callables.
+    
+        Unfiltered rows are cached until the next site/cell change; the row dicts
+        are shared between calls, so treat them as read-only.
         """
-        rows = []
-        for i, c in enumerate(self.cells):
-            s = self.sites[c['site_id']]
-            rows.append(dict(
-                cell_idx=i,
-                cell_name=c.get('name'),
-                band=c.get('band'),
-                site_name=s.get('name'),
-                site_uid=str(s.get('id')),
-                site_idx=int(c['site_id']),
-                x=float(s['x']),
-                y=float(s['y']),
-                sector_id=int(c['sector_id']),
-                sector_label=self._sector_label(int(c['sector_id'])),
-                sector_az_deg=float(s['az_deg'][c['sector_id']]),
-                fc_hz=float(c['fc_hz']),
-                fc_MHz=float(c['fc_hz'])/1e6,
-                fc_GHz=float(c['fc_hz'])/1e9,
-                tx_rs_power_dbm=float(c['tx_rs_power_dbm']),
-                tilt_deg=(None if c['tilt_deg'] is None else float(c['tilt_deg'])),
-                roll_deg=float(c['roll_deg']),
-                height_m_effective=float(c['height_m'] if c['height_m'] is not None else s['height']),
-                # Antenna configuration
-                bs_rows=int(c['bs_rows']),
-                bs_cols=int(c['bs_cols']),
-                bs_pol=str(c['bs_pol']),
-                bs_pol_type=str(c['bs_pol_type']),
-                elem_v_spacing=float(c['elem_v_spacing']),
-                elem_h_spacing=float(c['elem_h_spacing']),
-                antenna_pattern=str(c['antenna_pattern']),
-            ))
+        # Key the cache to the version seen before the build, so a build that
+        # overlaps a mutation is rebuilt on the next call
+        version = self._config_version
+        cached = self._cells_table_cache
+        if cached is not None and cached[0] == version:
+            rows = list(cached[1])
+        else:
+            rows = []
+            for i, c in enumerate(self.cells):
+                s = self.sites[c['site_id']]
+                rows.append(dict(
+                    cell_idx=i,
+                    cell_name=c.get('name'),
+                    band=c.get('band'),
+                    site_name=s.get('name'),
+                    site_uid=str(s.get('id')),
+                    site_idx=int(c['site_id']),
+                    x=float(s['x']),
+                    y=float(s['y']),
+                    sector_id=int(c['sector_id']),
+                    sector_label=self._sector_label(int(c['sector_id'])),
+                    sector_az_deg=float(s['az_deg'][c['sector_id']]),
+                    fc_hz=float(c['fc_hz']),
+                    fc_MHz=float(c['fc_hz'])/1e6,
+                    fc_GHz=float(c['fc_hz'])/1e9,
+                    tx_rs_power_dbm=float(c['tx_rs_power_dbm']),
+                    tilt_deg=(None if c['tilt_deg'] is None else float(c['tilt_deg'])),
+                    roll_deg=float(c['roll_deg']),
+                    height_m_effective=float(c['height_m'] if c['height_m'] is not None else s['height']),
+                    # Antenna configuration
+                    bs_rows=int(c['bs_rows']),
+                    bs_cols=int(c['bs_cols']),
+                    bs_pol=str(c['bs_pol']),
+                    bs_pol_type=str(c['bs_pol_type']),
+                    elem_v_spacing=float(c['elem_v_spacing']),
+                    elem_h_spacing=float(c['elem_h_spacing']),
+                    antenna_pattern=str(c['antenna_pattern']),
+                ))
+            self._cells_table_cache = (version, list(rows))
     
         # --- filtering ---
         if where:
@@ -801,6 +938,25 @@ class MultiCellSim:
                 pass
         return rows
     
+    def cells_frame(self):
+        """
+        Unfiltered cells_table() as a pandas DataFrame (one row per cell, same
+        order), cached until the next site/cell change. Treat as read-only.
+        Returns None if pandas is not installed.
+        """
+        # Keyed to the version seen before the build (see cells_table)
+        version = self._config_version
+        cached = self._cells_frame_cache
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        try:
+            import pandas as pd
+        except ImportError:
+            return None
+        df = pd.DataFrame(self.cells_table())
+        self._cells_frame_cache = (version, df)
+        return df
+    
     def summary_by_sector(self, as_dataframe: bool = False):
         """
         Aggregate per-sector view: azimuth, #cells, bands present, tilt stats.
@@ -864,12 +1020,18 @@ class MultiCellSim:
                 return site
             raise KeyError(f"Site index {site} out of range.")
         key = str(site)
+        # Names and uids are each unique, so a name hit whose uid matches too
+        # is the only possible match
+        i = self._site_idx_by_name.get(key)
+        if i is not None and str(self.sites[i].get('id')) == key:
+            return i
         for i, s in enumerate(self.sites):
             if str(s.get('id')) == key or s.get('name') == key:
                 return i
         raise KeyError(f"Unknown site '{site}'. Use an index, existing uid, or name.")
 
     # ---- helpers (add as methods) ----
+    @_bumps_config_version
     def configure_naming(self, *, use_site='id', sector_mode='1based', pattern=None):
         """use_site: 'id' or 'name'; sector_mode: '1based' or 'ABC'."""
         self.naming['use_site'] = use_site
@@ -890,6 +1052,18 @@ class MultiCellSim:
         sector = self._sector_label(sector_id)
         return self.naming['pattern'].format(band=band, site=site, sector=sector, sector_id=sector_id)    
 
+    def get_metadata_and_id(self, *, timestep_minutes=None, auto_increment: bool = True):
+        """
+        Single-call variant of get_metadata for minting a run.
+        Returns (base_meta, timestamp, unix_timestamp) where base_meta is the
+        include_time=False dict and the timestamp fields come from the same call.
+        """
+        meta = self.get_metadata(timestep_minutes=timestep_minutes, include_time=True,
+                                 auto_increment=auto_increment)
+        timestamp = meta.pop("timestamp")
+        unix_ts = meta.pop("unix_timestamp")
+        return meta, timestamp, unix_ts
+
     def get_metadata(self, *,
                      timestep=None,
                      timestep_minutes=None,   # client can pass what they’re polling with; we just echo
@@ -913,21 +1087,26 @@ class MultiCellSim:
         U = int(self.ue_loc.shape[1]) if (self.ue_loc is not None) else 0
 
         # Unique bands in first-seen order; fallback to MHz label if band missing
-        seen = {}
-        bands = []
-        for c in self.cells:
-            tag = c.get("band")
-            if tag is None or str(tag) == "":
-                tag = f"{int(round(float(c['fc_hz'])/1e6))}MHz"
-            tag = str(tag)
-            if tag not in seen:
-                seen[tag] = True
-                bands.append(tag)
+        # Versioned as in cells_table: keyed to the version read before the scan
+        version = self._config_version
+        cached = self._bands_cache
+        if cached is not None and cached[0] == version:
+            bands = list(cached[1])
+        else:
+            seen = {}
+            bands = []
+            for c in self.cells:
+                tag = c.get("band")
+                if tag is None or str(tag) == "":
+                    tag = f"{int(round(float(c['fc_hz'])/1e6))}MHz"
+                tag = str(tag)
+                if tag not in seen:
+                    seen[tag] = True
+                    bands.append(tag)
+            self._bands_cache = (version, list(bands))
 
         # Timestep counter tied to *this call* (i.e., to each pull)
         if timestep is None:
-            if not hasattr(self, "_timestep_counter"):
-                self._timestep_counter = 0
             ts_val = int(self._timestep_counter)
             if auto_increment:
                 self._timestep_counter += 1
@@ -6,8 +6,13 @@ Provides high-level helpers that simplify common simulation setup tasks.
 
 Key Functions:
     add_site_with_dualband_cells: Create tri-sector site with high+low band cells
-    iter_clustered_sites: Generate site positions in compact cluster layout
+    add_sites_with_dualband_cells_batch: Batch form for many sites with one band config
+    clustered_sites_array: Site positions in compact cluster layout as arrays
+    iter_clustered_sites: Per-site generator form of clustered_sites_array
     rsrp_rows_as_dicts: Convert RSRP matrix to per-UE measurement report dicts
+    iter_rsrp_rows_as_dicts: Generator form of rsrp_rows_as_dicts for streaming
+    get_or_build_labels: Report column labels, cached on the sim per config version
+    rsrp_arrow_ipc: Columnar (Arrow IPC stream) form of the measurement reports
 
 These helpers are used by the initialization module and simulation engine
 to provide consistent, configurable network topologies.
@@ -19,6 +24,31 @@ License: Apache 2.0
 import numpy as np
 import random
 import math
+import threading
+from collections import Counter
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; site placement falls back to NumPy
+    njit = None
+
+
+# Per-thread scratch buffers reused across report builds (see _mask_buffer)
+_scratch = threading.local()
+
+
+def _mask_buffer(shape):
+    """
+    Return a reusable boolean [U, C] buffer for the calling thread.
+    
+    Consecutive runs on an unchanged scenario have the same shape, so the
+    threshold mask is written in place instead of allocating U*C bytes per
+    run. Buffers are per thread, so concurrent builds never share one.
+    """
+    buf = getattr(_scratch, "mask", None)
+    if buf is None or buf.shape != shape:
+        buf = _scratch.mask = np.empty(shape, dtype=bool)
+    return buf
 
 
 def add_site_with_dualband_cells(
@@ -68,47 +98,95 @@ def add_site_with_dualband_cells(
     
     Returns: (site_idx, list_of_cell_indices_in_creation_order)
     """
-    # create the site (name & uid uniqueness enforced by your class)
-    site_idx = sim.add_site(x, y, height_m=height_m, az0_deg=az0_deg,
-                            name=site_name, uid=(uid or site_name))
-
-    added_cells = []
-    secs = (0, 1, 2)
+    (site_idx, added_cells), = add_sites_with_dualband_cells_batch(
+        sim, [x], [y], [az0_deg], [site_name],
+        height_m=height_m, uids=[uid or site_name],
+        fc_hi_hz=fc_hi_hz, band_hi=band_hi, tilt_hi_deg=tilt_hi_deg, pwr_hi_dbm=pwr_hi_dbm,
+        fc_lo_hz=fc_lo_hz, band_lo=band_lo, tilt_lo_deg=tilt_lo_deg, pwr_lo_dbm=pwr_lo_dbm,
+        bs_rows_hi=bs_rows_hi, bs_cols_hi=bs_cols_hi,
+        bs_pol_hi=bs_pol_hi, bs_pol_type_hi=bs_pol_type_hi,
+        elem_v_spacing_hi=elem_v_spacing_hi, elem_h_spacing_hi=elem_h_spacing_hi,
+        antenna_pattern_hi=antenna_pattern_hi,
+        bs_rows_lo=bs_rows_lo, bs_cols_lo=bs_cols_lo,
+        bs_pol_lo=bs_pol_lo, bs_pol_type_lo=bs_pol_type_lo,
+        elem_v_spacing_lo=elem_v_spacing_lo, elem_h_spacing_lo=elem_h_spacing_lo,
+        antenna_pattern_lo=antenna_pattern_lo,
+        order=order,
+    )
+    return site_idx, added_cells
 
+def add_sites_with_dualband_cells_batch(
+    sim,
+    xs,
+    ys,
+    azs,
+    site_names,
+    *,
+    height_m: float = 25.0,
+    uids=None,
+    # high band RF params
+    fc_hi_hz: float = 25_002e6, band_hi: str = "H", tilt_hi_deg: float = 6.0, pwr_hi_dbm: float = 0.0,
+    # low band RF params
+    fc_lo_hz: float = 600e6,    band_lo: str = "L", tilt_lo_deg: float = 3.0, pwr_lo_dbm: float = 0.0,
+    # high band antenna config (None = use sim defaults from arr_cfg)
+    bs_rows_hi: int | None = None,
+    bs_cols_hi: int | None = None,
+    bs_pol_hi: str | None = None,
+    bs_pol_type_hi: str | None = None,
+    elem_v_spacing_hi: float | None = None,
+    elem_h_spacing_hi: float | None = None,
+    antenna_pattern_hi: str | None = None,
+    # low band antenna config (None = use sim defaults from arr_cfg)
+    bs_rows_lo: int | None = None,
+    bs_cols_lo: int | None = None,
+    bs_pol_lo: str | None = None,
+    bs_pol_type_lo: str | None = None,
+    elem_v_spacing_lo: float | None = None,
+    elem_h_spacing_lo: float | None = None,
+    antenna_pattern_lo: str | None = None,
+    # control carrier block order (affects column grouping in RSRP_dBm)
+    order: str = "hi_lo",  # or "lo_hi"
+):
+    """
+    Batch form of add_site_with_dualband_cells: adds one dual-band site per
+    entry of the aligned xs / ys / azs (sector-0 azimuth) / site_names
+    sequences, all sharing the same band and antenna configuration.
+    
+    The per-band add_cell arguments are built once for the whole batch and
+    cells are attached by site index, so each site costs only its own
+    add_site + 6 add_cell calls. uids defaults to site_names.
+    
+    Returns: list of (site_idx, list_of_cell_indices_in_creation_order), one per site
+    """
     if order not in ("hi_lo", "lo_hi"):
         raise ValueError("order must be 'hi_lo' or 'lo_hi'")
 
-    for sec in secs:
-        if order == "hi_lo":
-            c_hi = sim.add_cell(site_name, sec, band=band_hi, fc_hz=fc_hi_hz,
-                                tilt_deg=tilt_hi_deg, tx_rs_power_dbm=pwr_hi_dbm,
-                                bs_rows=bs_rows_hi, bs_cols=bs_cols_hi, 
-                                bs_pol=bs_pol_hi, bs_pol_type=bs_pol_type_hi,
-                                elem_v_spacing=elem_v_spacing_hi, elem_h_spacing=elem_h_spacing_hi,
-                                antenna_pattern=antenna_pattern_hi)
-            c_lo = sim.add_cell(site_name, sec, band=band_lo, fc_hz=fc_lo_hz,
-                                tilt_deg=tilt_lo_deg, tx_rs_power_dbm=pwr_lo_dbm,
-                                bs_rows=bs_rows_lo, bs_cols=bs_cols_lo,
-                                bs_pol=bs_pol_lo, bs_pol_type=bs_pol_type_lo,
-                                elem_v_spacing=elem_v_spacing_lo, elem_h_spacing=elem_h_spacing_lo,
-                                antenna_pattern=antenna_pattern_lo)
-            added_cells.extend([c_hi, c_lo])
-        else:  # "lo_hi"
-            c_lo = sim.add_cell(site_name, sec, band=band_lo, fc_hz=fc_lo_hz,
-                                tilt_deg=tilt_lo_deg, tx_rs_power_dbm=pwr_lo_dbm,
-                                bs_rows=bs_rows_lo, bs_cols=bs_cols_lo,
-                                bs_pol=bs_pol_lo, bs_pol_type=bs_pol_type_lo,
-                                elem_v_spacing=elem_v_spacing_lo, elem_h_spacing=elem_h_spacing_lo,
-                                antenna_pattern=antenna_pattern_lo)
-            c_hi = sim.add_cell(site_name, sec, band=band_hi, fc_hz=fc_hi_hz,
-                                tilt_deg=tilt_hi_deg, tx_rs_power_dbm=pwr_hi_dbm,
-                                bs_rows=bs_rows_hi, bs_cols=bs_cols_hi,
-                                bs_pol=bs_pol_hi, bs_pol_type=bs_pol_type_hi,
-                                elem_v_spacing=elem_v_spacing_hi, elem_h_spacing=elem_h_spacing_hi,
-                                antenna_pattern=antenna_pattern_hi)
-            added_cells.extend([c_lo, c_hi])
+    hi = dict(band=band_hi, fc_hz=fc_hi_hz,
+              tilt_deg=tilt_hi_deg, tx_rs_power_dbm=pwr_hi_dbm,
+              bs_rows=bs_rows_hi, bs_cols=bs_cols_hi,
+              bs_pol=bs_pol_hi, bs_pol_type=bs_pol_type_hi,
+              elem_v_spacing=elem_v_spacing_hi, elem_h_spacing=elem_h_spacing_hi,
+              antenna_pattern=antenna_pattern_hi)
+    lo = dict(band=band_lo, fc_hz=fc_lo_hz,
+              tilt_deg=tilt_lo_deg, tx_rs_power_dbm=pwr_lo_dbm,
+              bs_rows=bs_rows_lo, bs_cols=bs_cols_lo,
+              bs_pol=bs_pol_lo, bs_pol_type=bs_pol_type_lo,
+              elem_v_spacing=elem_v_spacing_lo, elem_h_spacing=elem_h_spacing_lo,
+              antenna_pattern=antenna_pattern_lo)
+    # (sector, add_cell kwargs) in creation order for every site
+    plan = [(sec, kw) for sec in (0, 1, 2) for kw in ((hi, lo) if order == "hi_lo" else (lo, hi))]
 
-    return site_idx, added_cells
+    if uids is None:
+        uids = site_names
+    add_site = sim.add_site
+    add_cell = sim.add_cell
+
+    added = []
+    for x, y, az0, name, uid in zip(xs, ys, azs, site_names, uids):
+        # create the site (name & uid uniqueness enforced by your class)
+        site_idx = add_site(x, y, height_m=height_m, az0_deg=az0, name=name, uid=uid)
+        added.append((site_idx, [add_cell(site_idx, sec, **kw) for sec, kw in plan]))
+    return added
 
 def _labels_from_meta(cells_meta, mode="bxy", suffix_freq_on_dup=True):
     """
@@ -131,27 +209,53 @@ def _labels_from_meta(cells_meta, mode="bxy", suffix_freq_on_dup=True):
         >>> _labels_from_meta(meta, mode="bxy")
         ['b11']
     """
-    labels = []
-    seen = {}
-    for m in cells_meta:
-        if mode == "name":
-            base = str(m["name"])
+    if mode == "name":
+        labels = [str(m["name"]) for m in cells_meta]
+    else:
+        labels = [f"b{int(m['site_id'])+1}{int(m['sector_id'])+1}" for m in cells_meta]
+    if not suffix_freq_on_dup:
+        return labels
+    counts = Counter(labels)
+    if len(counts) == len(labels):
+        return labels  # all unique (the usual case), nothing to suffix
+
+    # First occurrence of a duplicated base keeps it; later ones get the frequency
+    seen = set()
+    for i, base in enumerate(labels):
+        if counts[base] == 1:
+            continue
+        if base in seen:
+            mhz = int(round(float(cells_meta[i]["fc_hz"]) / 1e6))
+            labels[i] = f"{base}_{mhz}MHz"
         else:
-            base = f"b{int(m['site_id'])+1}{int(m['sector_id'])+1}"
-        lab = base
-        if base in seen and suffix_freq_on_dup:
-            mhz = int(round(float(m["fc_hz"]) / 1e6))
-            lab = f"{base}_{mhz}MHz"
-        seen[base] = seen.get(base, 0) + 1
-        labels.append(lab)
+            seen.add(base)
     return labels
 
-def rsrp_rows_as_dicts(RSRP_dBm, cells_meta, *,
+def get_or_build_labels(sim, cells_meta, mode="bxy", suffix_freq_on_dup=True, version=None):
+    """
+    Return _labels_from_meta(cells_meta, ...) cached on sim._labels_cache.
+    
+    Labels only change when the site/cell config does, so entries are keyed
+    on the config version. Pass the version that cells_meta was produced
+    under (e.g. captured around sim.compute()); defaults to the current one.
+    """
+    if version is None:
+        version = sim._config_version
+    key = (mode, bool(suffix_freq_on_dup))
+    cached = sim._labels_cache.get(key)
+    if cached is None or cached[0] != version or len(cached[1]) != len(cells_meta):
+        cached = (version, _labels_from_meta(cells_meta, mode=mode, suffix_freq_on_dup=suffix_freq_on_dup))
+        sim._labels_cache[key] = cached
+    return cached[1]
+
+def iter_rsrp_rows_as_dicts(RSRP_dBm, cells_meta, *,
                        threshold_dbm=-124.0,
                        user_prefix="user_", user_pad=6,
                        label_mode="bxy",  # or "name"
                        suffix_freq_on_dup=True,
-                       ue_locations=None):
+                       ue_locations=None,
+                       precision=None,
+                       labels=None):
     """
     Convert RSRP matrix to per-UE measurement report dictionaries.
     
@@ -167,10 +271,14 @@ def rsrp_rows_as_dicts(RSRP_dBm, cells_meta, *,
         user_pad: Zero-padding width for user IDs (default: 6)
         label_mode: Cell label format - "name" or "bxy" (default: "bxy")
         suffix_freq_on_dup: Append frequency suffix on duplicate labels
-        ue_locations: Optional [U, 3] array with UE x,y,z coordinates
+        ue_locations: Optional [U, 2] or [U, 3] array with UE x,y(,z) coordinates
+        precision: Optional number of decimals to round readings to (e.g. 2
+                   for 0.01 dB); None keeps full float32 precision
+        labels: Optional precomputed column labels (see get_or_build_labels);
+                built from cells_meta when omitted
     
-    Returns:
-        list: Per-UE measurement report dicts with format:
+    Yields:
+        dict: One per-UE measurement report, in UE order, with format:
             {
                 "user_id": "user_000000",
                 "x": 123.45,  # if ue_locations provided
@@ -183,7 +291,7 @@ def rsrp_rows_as_dicts(RSRP_dBm, cells_meta, *,
     Example:
         >>> RSRP = np.array([[-80.0, -120.0], [-95.0, -85.0]])  # 2 UEs, 2 cells
         >>> meta = [{"name": "CELL_A", ...}, {"name": "CELL_B", ...}]
-        >>> reports = rsrp_rows_as_dicts(RSRP, meta, threshold_dbm=-100, label_mode="name")
+        >>> reports = list(iter_rsrp_rows_as_dicts(RSRP, meta, threshold_dbm=-100, label_mode="name"))
         >>> reports[0]
         {'user_id': 'user_000000', 'CELL_A': -80.0}
         >>> reports[1]
@@ -192,29 +300,141 @@ def rsrp_rows_as_dicts(RSRP_dBm, cells_meta, *,
     Note:
         Cells below threshold_dbm are excluded from output for efficiency.
         This typically reduces JSON payload size by 80-95% for large networks.
+        
+        The threshold mask, (user, cell) extraction and label/value gathering
+        are done once over the whole matrix in NumPy; the Python loop only
+        slices each UE's pre-gathered entries into its dict.
+        
+        Rows are yielded one at a time so consumers such as persist_run can
+        stream them to the database without holding all U dicts in memory.
     """
-    R = np.asarray(RSRP_dBm)
+    R = np.ascontiguousarray(RSRP_dBm, dtype=np.float32)
     assert R.ndim == 2, "RSRP_dBm must be [U, C]"
     assert R.shape[1] == len(cells_meta), "C mismatch: columns vs cells_meta"
 
-    labels = _labels_from_meta(cells_meta, mode=label_mode, suffix_freq_on_dup=suffix_freq_on_dup)
-    mask = R >= float(threshold_dbm)
+    U = R.shape[0]
+    if labels is None:
+        labels = _labels_from_meta(cells_meta, mode=label_mode, suffix_freq_on_dup=suffix_freq_on_dup)
+    assert len(labels) == R.shape[1], "C mismatch: columns vs labels"
+    mask = np.greater_equal(R, float(threshold_dbm), out=_mask_buffer(R.shape))
 
-    out = []
-    for u in range(R.shape[0]):
-        row = {"user_id": f"{user_prefix}{u:0{user_pad}d}"}
-        
-        # Add UE x, y coordinates if provided
-        if ue_locations is not None:
-            row["x"] = float(ue_locations[u, 0])
-            row["y"] = float(ue_locations[u, 1])
-        
-        for i in np.nonzero(mask[u])[0]:
-            row[labels[i]] = float(R[u, i])
-        out.append(row)
-    return out 
+    # Flat (row-major, so sorted) positions of readings above threshold: one
+    # index array gives the cell columns, the per-UE spans and a 1-D gather
+    C = R.shape[1]
+    flat = np.flatnonzero(mask)
+    cols = flat % C
+    bounds = np.searchsorted(flat, np.arange(U + 1) * C).tolist()
+    kept_labels = np.asarray(labels, dtype=object)[cols].tolist()
+    kept_vals = R.ravel().take(flat)
+    if precision is not None:
+        # Round in float64 so values like -85.2 serialize short (float32 can't hold them)
+        kept_vals = np.round(kept_vals.astype(np.float64), int(precision))
+    kept_vals = kept_vals.tolist()
 
-def iter_clustered_sites(n_sites, spacing=600.0, center=(0.0, 0.0), jitter=0.05, seed=42):
+    # Walk each UE's [start, end) span of the flat kept lists
+    spans = zip(bounds, bounds[1:])
+    if ue_locations is None:
+        for u, (s, e) in enumerate(spans):
+            row = {"user_id": f"{user_prefix}{u:0{user_pad}d}"}
+            row.update(zip(kept_labels[s:e], kept_vals[s:e]))
+            yield row
+    else:
+        # Add UE x, y coordinates (converted to Python floats in one call)
+        xy = np.asarray(ue_locations)[:, :2].tolist()
+        for u, ((s, e), (x, y)) in enumerate(zip(spans, xy)):
+            row = {"user_id": f"{user_prefix}{u:0{user_pad}d}", "x": x, "y": y}
+            row.update(zip(kept_labels[s:e], kept_vals[s:e]))
+            yield row
+
+
+def rsrp_rows_as_dicts(RSRP_dBm, cells_meta, **kwargs):
+    """
+    Convert RSRP matrix to a list of per-UE measurement report dictionaries.
+    
+    List-returning wrapper around iter_rsrp_rows_as_dicts; accepts the same
+    keyword arguments (threshold_dbm, user_prefix, user_pad, label_mode,
+    suffix_freq_on_dup, ue_locations).
+    
+    Returns:
+        list: Per-UE measurement report dicts (see iter_rsrp_rows_as_dicts)
+    """
+    return list(iter_rsrp_rows_as_dicts(RSRP_dBm, cells_meta, **kwargs))
+
+def rsrp_arrow_ipc(RSRP_dBm, labels, *,
+                   threshold_dbm=-124.0,
+                   user_prefix="user_", user_pad=6,
+                   ue_locations=None,
+                   quantize=False):
+    """
+    Encode the RSRP matrix as a single-batch Arrow IPC stream.
+    
+    Columnar counterpart of iter_rsrp_rows_as_dicts for analytics clients
+    (pandas, polars, duckdb): one row per UE with columns user_id, x, y (if
+    ue_locations is given) and one float32 column per cell label. Readings
+    below threshold_dbm are null rather than absent.
+    
+    With quantize=True the cell columns are int16 centi-dB (dBm * 100,
+    i.e. 0.01 dB steps) instead, halving their size; the scale is recorded
+    in the schema metadata as rsrp_scale=0.01. The threshold is still
+    applied to the unquantized values.
+    
+    Args:
+        RSRP_dBm: RSRP matrix [num_ues, num_cells] in dBm
+        labels: Column labels, one per cell (see get_or_build_labels)
+        threshold_dbm, user_prefix, user_pad, ue_locations: as for
+            iter_rsrp_rows_as_dicts
+        quantize: Emit int16 centi-dB cell columns instead of float32 dBm
+    
+    Returns:
+        bytes: Arrow IPC stream (media type application/vnd.apache.arrow.stream)
+    """
+    import pyarrow as pa
+
+    R = np.asarray(RSRP_dBm, dtype=np.float32)
+    assert R.ndim == 2, "RSRP_dBm must be [U, C]"
+    assert R.shape[1] == len(labels), "C mismatch: columns vs labels"
+    U = R.shape[0]
+
+    # Cell-major copy so each column is one contiguous slice
+    Rt = np.ascontiguousarray(R.T)
+    below = Rt < np.float32(threshold_dbm)
+    if quantize:
+        Rt = np.clip(np.rint(Rt * 100.0), -32768, 32767).astype(np.int16)
+
+    names = ["user_id"]
+    arrays = [pa.array([f"{user_prefix}{u:0{user_pad}d}" for u in range(U)], type=pa.string())]
+    if ue_locations is not None:
+        xy = np.asarray(ue_locations, dtype=np.float32)
+        names += ["x", "y"]
+        arrays += [pa.array(np.ascontiguousarray(xy[:, 0])), pa.array(np.ascontiguousarray(xy[:, 1]))]
+    names += list(labels)
+    arrays += [pa.array(Rt[j], mask=below[j]) for j in range(Rt.shape[0])]
+
+    batch = pa.RecordBatch.from_arrays(arrays, names=names)
+    if quantize:
+        batch = batch.replace_schema_metadata({"rsrp_unit": "dBm", "rsrp_scale": "0.01"})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+def _spiral_positions_py(n_sites, scale, golden_angle, cx, cy):
+    """Base (jitter-free) spiral coordinates and angles for clustered_sites_array."""
+    i = np.arange(1, n_sites + 1).astype(np.float64)
+    r = scale * np.sqrt(i)
+    theta = i * golden_angle
+
+    # Base coordinates in a disk cluster
+    xs = cx + r * np.cos(theta)
+    ys = cy + r * np.sin(theta)
+    return xs, ys, theta
+
+
+# JIT-compiled when numba is installed (cached on disk across processes)
+_spiral_positions = njit(cache=True)(_spiral_positions_py) if njit is not None else _spiral_positions_py
+
+
+def clustered_sites_array(n_sites, spacing=600.0, center=(0.0, 0.0), jitter=0.05, seed=42):
     """
     Generate site positions in a compact radial cluster layout.
     
@@ -233,13 +453,14 @@ def iter_clustered_sites(n_sites, spacing=600.0, center=(0.0, 0.0), jitter=0.05,
                 Set to 0 for perfectly deterministic positions
         seed: Random seed for jitter (default: 42)
     
-    Yields:
-        tuple: (x, y, az0_deg) for each site where:
-            - x, y: Site coordinates in meters
-            - az0_deg: Sector-0 azimuth in degrees (pointing outward from center)
+    Returns:
+        tuple: (xs, ys, az0_deg) arrays of shape (n_sites,) where:
+            - xs, ys: Site coordinates in meters (float64)
+            - az0_deg: Sector-0 azimuths in whole degrees (int64, pointing outward from center)
     
     Example:
-        >>> for x, y, az0 in iter_clustered_sites(n_sites=3, spacing=500):
+        >>> xs, ys, azs = clustered_sites_array(n_sites=3, spacing=500)
+        >>> for x, y, az0 in zip(xs, ys, azs):
         ...     print(f"Site at ({x:.1f}, {y:.1f}) with azimuth {az0}°")
         Site at (159.2, 0.0) with azimuth 0°
         Site at (-87.3, -213.8) with azimuth 218°
@@ -265,23 +486,38 @@ def iter_clustered_sites(n_sites, spacing=600.0, center=(0.0, 0.0), jitter=0.05,
     scale = spacing / math.sqrt(math.pi)
 
     cx, cy = center
-    for i in range(1, n_sites + 1):
-        r = scale * math.sqrt(i)
-        theta = i * golden_angle
+    xs, ys, theta = _spiral_positions(int(n_sites), float(scale), float(golden_angle), float(cx), float(cy))
 
-        # Base coordinates in a disk cluster
-        x = cx + r * math.cos(theta)
-        y = cy + r * math.sin(theta)
+    # Small jitter to avoid perfect symmetry. Draws come from the seeded
+    # `random` stream in the original per-site (x, y) order, so a given seed
+    # still produces the same layout.
+    if jitter > 0:
+        draws = np.fromiter((random.uniform(-1, 1) for _ in range(2 * n_sites)),
+                            dtype=np.float64, count=2 * n_sites).reshape(n_sites, 2)
+        xs += draws[:, 0] * spacing * jitter
+        ys += draws[:, 1] * spacing * jitter
 
-        # Small jitter to avoid perfect symmetry
-        if jitter > 0:
-            x += (random.uniform(-1, 1)) * spacing * jitter
-            y += (random.uniform(-1, 1)) * spacing * jitter
+    # Sector-0 azimuth (rounded to whole degrees, outward from center)
+    az0 = np.round((np.degrees(theta) + 180.0) % 360.0).astype(np.int64)
 
-        # Sector-0 azimuth (rounded to whole degrees, outward from center)
-        az0_deg = int(round((math.degrees(theta) + 180.0) % 360.0))
+    return xs, ys, az0
 
-        yield x, y, az0_deg    
+
+def iter_clustered_sites(n_sites, spacing=600.0, center=(0.0, 0.0), jitter=0.05, seed=42):
+    """
+    Generate site positions in a compact radial cluster layout.
+    
+    Per-site view of clustered_sites_array(), kept for callers that iterate.
+    
+    Yields:
+        tuple: (x, y, az0_deg) for each site
+    
+    Example:
+        >>> for x, y, az0 in iter_clustered_sites(n_sites=3, spacing=500):
+        ...     print(f"Site at ({x:.1f}, {y:.1f}) with azimuth {az0}°")
+    """
+    xs, ys, az0 = clustered_sites_array(n_sites, spacing=spacing, center=center, jitter=jitter, seed=seed)
+    yield from zip(xs.tolist(), ys.tolist(), az0.tolist())
 
 
 
@@ -4,14 +4,40 @@ Simulation Initialization Module for SmartRAN Studio Simulation
 Provides on-demand initialization with configurable parameters.
 """
 
-from typing import Optional
-from pydantic import BaseModel, Field
+from collections import OrderedDict
+from typing import Annotated, Literal, Optional, Union
+from pydantic import BaseModel, ConfigDict, Field
+from dataclasses import dataclass
+from functools import cached_property
+import copy
 import logging
-from simulation.helpers import add_site_with_dualband_cells, iter_clustered_sites
+import os
+import numpy as np
+from simulation.helpers import add_sites_with_dualband_cells_batch, clustered_sites_array
 from simulation.engine import MultiCellSim
 
 logger = logging.getLogger(__name__)
 
+# Recently built simulations, keyed on their init config (LRU, see initialize_simulation)
+_INIT_CACHE: "OrderedDict[tuple, InitResult]" = OrderedDict()
+_INIT_CACHE_SIZE = 8
+
+
+def _log(event: str, **kv):
+    """
+    Log an init event at INFO with its fields attached as record attributes.
+    
+    Fields go to `extra` for structured handlers and are also rendered as
+    key=value pairs (lazily, by the logging module) for plain-text output.
+    Nothing is built when INFO is disabled.
+    """
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(event + "".join(f" {k}=%s" for k in kv), *kv.values(), extra=kv)
+
+# Auto chunk sizing: per-tile budget and bytes per (cell, UE) element (complex64 + overhead)
+_DEFAULT_L2_TILE_BYTES = 1 << 20
+_TILE_BYTES_PER_ELEM = 16
+
 
 class SimInitializationRequest(BaseModel):
     """
@@ -23,7 +49,9 @@ class SimInitializationRequest(BaseModel):
     # Site layout
     n_sites: int = Field(10, ge=0, description="Number of sites to create (0 for manual placement)")
     spacing: float = Field(500.0, gt=0, description="Target inter-site spacing in meters")
-    seed: int = Field(7, description="Random seed (used for both site placement and UE drop)")
+    seed: int = Field(7, description="Random seed; independent site placement and UE drop seeds are derived from it")
+    site_seed: Optional[int] = Field(None, description="Override the derived site placement seed")
+    ue_seed: Optional[int] = Field(None, description="Override the derived UE drop seed")
     jitter: float = Field(0.06, ge=0.0, le=1.0, description="Site position jitter (fraction of spacing)")
     
     # Site configuration
@@ -46,13 +74,22 @@ class SimInitializationRequest(BaseModel):
     # UE configuration
     num_ue: int = Field(30000, ge=1, description="Number of UEs to drop")
     box_pad_m: float = Field(250.0, gt=0, description="Box padding around sites in meters")
+    ue_drop_shards: int = Field(1, ge=1, description="Threads for the UE drop; each draws from a child seed, so the drop depends on this value")
     
     # Chunking (optional, for memory management)
-    cells_chunk: Optional[int] = Field(48, ge=1, description="Cell chunk size for compute")
-    ue_chunk: Optional[int] = Field(500, ge=1, description="UE chunk size for compute")
+    cells_chunk: Optional[Union[Annotated[int, Field(ge=1)], Literal["auto"]]] = Field(
+        48, description="Cell chunk size for compute ('auto' sizes the tile to L2_TILE_BYTES)"
+    )
+    ue_chunk: Optional[Union[Annotated[int, Field(ge=1)], Literal["auto"]]] = Field(
+        500, description="UE chunk size for compute ('auto' sizes the tile to L2_TILE_BYTES)"
+    )
+    
+    # Caching
+    force_rebuild: bool = Field(False, description="Rebuild even if an identical configuration is cached")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "examples": [
                 {
                     "n_sites": 10,
@@ -84,29 +121,155 @@ class SimInitializationRequest(BaseModel):
                 }
             ]
         }
+    )
+
+
+@dataclass
+class InitResult:
+    """
+    Result of initialize_simulation.
+    
+    Also readable as a mapping (result['sim'], result['config_summary'], ...)
+    like the dict it replaces. config_summary is only built on first access.
+    """
+    sim: MultiCellSim
+    config: SimInitializationRequest
+    num_sites: int
+    num_cells: int
+    num_ues: int
+    num_hi_cells: int
+    num_lo_cells: int
+    site_seed: int
+    ue_seed: int
+    
+    _KEYS = ("sim", "num_sites", "num_cells", "num_ues", "num_hi_cells", "num_lo_cells", "config_summary")
+    
+    def __getitem__(self, key):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    @cached_property
+    def config_summary(self) -> dict:
+        config = self.config
+        return {
+            "n_sites": config.n_sites,
+            "spacing_m": config.spacing,
+            "seed": config.seed,
+            "site_seed": self.site_seed,
+            "ue_seed": self.ue_seed,
+            "site_height_m": config.site_height_m,
+            "high_band": {
+                "fc_hz": config.fc_hi_hz,
+                "fc_ghz": config.fc_hi_hz / 1e9,
+                "tilt_deg": config.tilt_hi_deg,
+                "antenna": f"{config.bs_rows_hi}x{config.bs_cols_hi}",
+                "pattern": config.antenna_pattern_hi,
+            },
+            "low_band": {
+                "fc_hz": config.fc_lo_hz,
+                "fc_ghz": config.fc_lo_hz / 1e9,
+                "tilt_deg": config.tilt_lo_deg,
+                "antenna": f"{config.bs_rows_lo}x{config.bs_cols_lo}",
+                "pattern": config.antenna_pattern_lo,
+            },
+            "ues": {
+                "num_ue": config.num_ue,
+                "box_pad_m": config.box_pad_m,
+                "drop_shards": config.ue_drop_shards,
+            },
+            "chunking": {
+                "cells_chunk": self.sim.cells_chunk,
+                "ue_chunk": self.sim.ue_chunk,
+            }
+        }
+
+
+def derive_seeds(config: SimInitializationRequest) -> tuple:
+    """
+    Return (site_seed, ue_seed) for config.
+    
+    Both are spawned from np.random.SeedSequence(config.seed), so the site
+    layout and the UE drop draw from independent streams; an explicit
+    site_seed / ue_seed overrides its derived value, letting one phase vary
+    while the other stays fixed.
+    """
+    site_ss, ue_ss = np.random.SeedSequence(config.seed).spawn(2)
+    site_seed = int(site_ss.generate_state(1, dtype=np.uint32)[0])
+    ue_seed = int(ue_ss.generate_state(1, dtype=np.uint32)[0])
+    if config.site_seed is not None:
+        site_seed = config.site_seed
+    if config.ue_seed is not None:
+        ue_seed = config.ue_seed
+    return site_seed, ue_seed
 
 
-def initialize_simulation(config: SimInitializationRequest) -> dict:
+def initialize_simulation(config: SimInitializationRequest) -> InitResult:
     """
     Initialize a new simulation with the given configuration.
     
+    Builds are deterministic for a given config, so the last few are kept
+    and a repeated config returns a deep copy of the cached build instead
+    of recreating every site and redropping the UEs. Set force_rebuild to
+    bypass the cache.
+    
     Args:
         config: SimInitializationRequest with initialization parameters
         
     Returns:
-        Dictionary with:
+        InitResult (also indexable like a dict) with:
             - sim: The initialized MultiCellSim object
             - num_sites: Number of sites created
             - num_cells: Number of cells created
             - num_ues: Number of UEs dropped
-            - config_summary: Summary of configuration used
+            - num_hi_cells, num_lo_cells: Cells per band
+            - config_summary: Summary of configuration used (built lazily)
             
     Example:
         >>> config = SimInitializationRequest(n_sites=10, num_ue=30000)
         >>> result = initialize_simulation(config)
         >>> sim = result['sim']
     """
-    logger.info("Initializing simulation with custom configuration...")
+    key = tuple(config.model_dump(exclude={"force_rebuild"}).items())
+    cached = None if config.force_rebuild else _INIT_CACHE.get(key)
+    if cached is not None:
+        _INIT_CACHE.move_to_end(key)
+        _log("init_cache_hit")
+        return copy.deepcopy(cached)
+    
+    result = _build_simulation(config)
+    # Keep a pristine copy: the returned sim is handed out and mutated by callers
+    _INIT_CACHE[key] = copy.deepcopy(result)
+    _INIT_CACHE.move_to_end(key)
+    while len(_INIT_CACHE) > _INIT_CACHE_SIZE:
+        _INIT_CACHE.popitem(last=False)
+    return result
+
+
+def resolve_chunk_sizes(cells_chunk, ue_chunk, *, num_cells: int, num_ues: int):
+    """
+    Resolve "auto" chunk sizes so one (cells_chunk x ue_chunk) tile fits the L2 budget.
+    
+    The budget defaults to 1 MiB and can be overridden with the L2_TILE_BYTES
+    environment variable. Explicit sizes (and None, meaning no chunking) are
+    returned unchanged.
+    """
+    if cells_chunk != "auto" and ue_chunk != "auto":
+        return cells_chunk, ue_chunk
+    target = int(os.environ.get("L2_TILE_BYTES", _DEFAULT_L2_TILE_BYTES))
+    bpe = _TILE_BYTES_PER_ELEM
+    num_cells = max(1, num_cells)
+    if ue_chunk == "auto":
+        cells_per_tile = num_cells if cells_chunk in ("auto", None) else cells_chunk
+        ue_chunk = min(num_ues, max(64, target // (cells_per_tile * bpe)))
+    if cells_chunk == "auto":
+        cells_chunk = min(num_cells, max(8, target // ((ue_chunk or num_ues) * bpe)))
+    return cells_chunk, ue_chunk
+
+
+def _build_simulation(config: SimInitializationRequest) -> InitResult:
+    """Build a simulation from config (uncached body of initialize_simulation)"""
+    _log("init_started")
     
     # 0) Instantiate simulation object
     # NOTE: These are fixed - not configurable via endpoint
@@ -115,106 +278,84 @@ def initialize_simulation(config: SimInitializationRequest) -> dict:
     # 1) Configure naming convention (fixed)
     sim.configure_naming(use_site='id', sector_mode='1based', pattern='{band}{site}{sector}')
     
+    site_seed, ue_seed = derive_seeds(config)
+    
     # 2) Add sites with dual-band cells
-    logger.info(f"Creating {config.n_sites} sites with spacing={config.spacing}m, seed={config.seed}")
-    
-    for idx, (x, y, az0) in enumerate(
-        iter_clustered_sites(
-            n_sites=config.n_sites,
-            spacing=config.spacing,
-            center=(0.0, 0.0),
-            jitter=config.jitter,
-            seed=config.seed
-        ),
-        start=1
-    ):
-        site_name = f"SITE{idx:04d}A"
-        
-        add_site_with_dualband_cells(
-            sim,
-            site_name=site_name,
-            x=x, y=y,
-            height_m=config.site_height_m,
-            az0_deg=az0,
-            # High band (configurable)
-            fc_hi_hz=config.fc_hi_hz,
-            band_hi="H",  # Fixed
-            tilt_hi_deg=config.tilt_hi_deg,
-            pwr_hi_dbm=0.0,  # Fixed
-            bs_rows_hi=config.bs_rows_hi,
-            bs_cols_hi=config.bs_cols_hi,
-            antenna_pattern_hi=config.antenna_pattern_hi,
-            # Low band (configurable)
-            fc_lo_hz=config.fc_lo_hz,
-            band_lo="L",  # Fixed
-            tilt_lo_deg=config.tilt_lo_deg,
-            pwr_lo_dbm=0.0,  # Fixed
-            bs_rows_lo=config.bs_rows_lo,
-            bs_cols_lo=config.bs_cols_lo,
-            antenna_pattern_lo=config.antenna_pattern_lo,
-            order="hi_lo",  # Fixed
-        )
+    _log("sites_creating", n_sites=config.n_sites, spacing_m=config.spacing,
+         seed=config.seed, site_seed=site_seed)
     
-    # 3) Drop UEs (using same seed)
-    logger.info(f"Dropping {config.num_ue} UEs with box_pad_m={config.box_pad_m}, seed={config.seed}")
+    # Layout is computed up front; the config is read once for the whole batch
+    xs, ys, azs = clustered_sites_array(
+        n_sites=config.n_sites,
+        spacing=config.spacing,
+        center=(0.0, 0.0),
+        jitter=config.jitter,
+        seed=site_seed
+    )
+    site_names = [f"SITE{idx:04d}A" for idx in range(1, len(xs) + 1)]
+    
+    added_sites = add_sites_with_dualband_cells_batch(
+        sim,
+        xs.tolist(), ys.tolist(), azs.tolist(), site_names,
+        height_m=config.site_height_m,
+        # High band (configurable)
+        fc_hi_hz=config.fc_hi_hz,
+        band_hi="H",  # Fixed
+        tilt_hi_deg=config.tilt_hi_deg,
+        pwr_hi_dbm=0.0,  # Fixed
+        bs_rows_hi=config.bs_rows_hi,
+        bs_cols_hi=config.bs_cols_hi,
+        antenna_pattern_hi=config.antenna_pattern_hi,
+        # Low band (configurable)
+        fc_lo_hz=config.fc_lo_hz,
+        band_lo="L",  # Fixed
+        tilt_lo_deg=config.tilt_lo_deg,
+        pwr_lo_dbm=0.0,  # Fixed
+        bs_rows_lo=config.bs_rows_lo,
+        bs_cols_lo=config.bs_cols_lo,
+        antenna_pattern_lo=config.antenna_pattern_lo,
+        order="hi_lo",  # Fixed
+    )
+    
+    # 3) Drop UEs (independent stream from the site layout)
+    _log("ues_dropping", n_ues=config.num_ue, box_pad_m=config.box_pad_m,
+         ue_seed=ue_seed, shards=config.ue_drop_shards)
     sim.drop_ues(
         num_ue=config.num_ue,
         layout='box',
         box_pad_m=config.box_pad_m,
-        seed=config.seed
+        seed=ue_seed,
+        shards=config.ue_drop_shards
     )
     
+    # Get counts (from what this build added, not from the sim's lists)
+    num_sites = len(added_sites)
+    num_cells = sum(len(cell_idxs) for _, cell_idxs in added_sites)
+    num_ues = config.num_ue
+    if sim.ue_loc.shape[1] != num_ues:
+        raise RuntimeError(
+            f"drop_ues produced {sim.ue_loc.shape[1]} UEs, expected {num_ues}"
+        )
+    # Each dual-band site adds one high and one low band cell per sector
+    num_hi_cells = num_lo_cells = 3 * num_sites
+    
     # 4) Set chunking parameters
-    sim.cells_chunk = config.cells_chunk
-    sim.ue_chunk = config.ue_chunk
-    
-    # Get counts
-    num_sites = len(sim.sites)
-    num_cells = len(sim.cells)
-    num_ues = sim.ue_loc.shape[1] if sim.ue_loc is not None else 0
-    num_hi_cells = len([c for c in sim.cells if c['fc_hz'] == config.fc_hi_hz])
-    num_lo_cells = len([c for c in sim.cells if c['fc_hz'] == config.fc_lo_hz])
-    
-    logger.info(f"Simulation initialized successfully:")
-    logger.info(f"  - Sites: {num_sites}")
-    logger.info(f"  - Cells: {num_cells} (High band: {num_hi_cells}, Low band: {num_lo_cells})")
-    logger.info(f"  - UEs: {num_ues}")
-    logger.info(f"  - Chunk sizes: cells_chunk={sim.cells_chunk}, ue_chunk={sim.ue_chunk}")
-    
-    return {
-        "sim": sim,
-        "num_sites": num_sites,
-        "num_cells": num_cells,
-        "num_ues": num_ues,
-        "num_hi_cells": num_hi_cells,
-        "num_lo_cells": num_lo_cells,
-        "config_summary": {
-            "n_sites": config.n_sites,
-            "spacing_m": config.spacing,
-            "seed": config.seed,
-            "site_height_m": config.site_height_m,
-            "high_band": {
-                "fc_hz": config.fc_hi_hz,
-                "fc_ghz": config.fc_hi_hz / 1e9,
-                "tilt_deg": config.tilt_hi_deg,
-                "antenna": f"{config.bs_rows_hi}x{config.bs_cols_hi}",
-                "pattern": config.antenna_pattern_hi,
-            },
-            "low_band": {
-                "fc_hz": config.fc_lo_hz,
-                "fc_ghz": config.fc_lo_hz / 1e9,
-                "tilt_deg": config.tilt_lo_deg,
-                "antenna": f"{config.bs_rows_lo}x{config.bs_cols_lo}",
-                "pattern": config.antenna_pattern_lo,
-            },
-            "ues": {
-                "num_ue": config.num_ue,
-                "box_pad_m": config.box_pad_m,
-            },
-            "chunking": {
-                "cells_chunk": config.cells_chunk,
-                "ue_chunk": config.ue_chunk,
-            }
-        }
-    }
-
+    sim.cells_chunk, sim.ue_chunk = resolve_chunk_sizes(
+        config.cells_chunk, config.ue_chunk, num_cells=num_cells, num_ues=num_ues
+    )
+    
+    _log("init_completed", n_sites=num_sites, n_cells=num_cells,
+         n_hi_cells=num_hi_cells, n_lo_cells=num_lo_cells, n_ues=num_ues,
+         cells_chunk=sim.cells_chunk, ue_chunk=sim.ue_chunk)
+    
+    return InitResult(
+        sim=sim,
+        config=config,
+        num_sites=num_sites,
+        num_cells=num_cells,
+        num_ues=num_ues,
+        num_hi_cells=num_hi_cells,
+        num_lo_cells=num_lo_cells,
+        site_seed=site_seed,
+        ue_seed=ue_seed,
+    )
@@ -0,0 +1,70 @@
+"""
+Tests for the config-version keyed caches on MultiCellSim.
+
+Run from smartran-studio-sim-engine/: python -m pytest tests
+"""
+
+from simulation.engine import MultiCellSim
+
+
+class _BumpOnIter(list):
+    """Cell list that bumps the sim's config version when scanned,
+    standing in for a mutation that lands while a cache is being built."""
+
+    def __init__(self, sim, cells):
+        super().__init__(cells)
+        self._sim = sim
+
+    def __iter__(self):
+        self._sim._config_version += 1
+        return super().__iter__()
+
+
+def _sim_with_cell():
+    sim = MultiCellSim()
+    site = sim.add_site(0.0, 0.0, name="SITE0001A")
+    sim.add_cell(site, 0, band="H", fc_hz=2.5e9)
+    return sim
+
+
+def test_bands_cache_keyed_to_version_before_build():
+    sim = _sim_with_cell()
+    before = sim._config_version
+    sim.cells = _BumpOnIter(sim, sim.cells)
+
+    assert sim.get_metadata()["bands"] == ["H"]
+    assert sim._bands_cache[0] == before
+
+    # The next call must not serve the entry built during the mutation
+    sim.cells = list(sim.cells)
+    sim.cells.append(dict(sim.cells[0], band="L", name="LSITE0001A1"))
+    assert sim.get_metadata()["bands"] == ["H", "L"]
+    assert sim._bands_cache[0] == sim._config_version
+
+
+def test_cells_table_cache_keyed_to_version_before_build():
+    sim = _sim_with_cell()
+    before = sim._config_version
+    sim.cells = _BumpOnIter(sim, sim.cells)
+
+    assert len(sim.cells_table()) == 1
+    assert sim._cells_table_cache[0] == before
+
+    sim.cells = list(sim.cells)
+    sim.cells.append(dict(sim.cells[0], band="L", name="LSITE0001A1"))
+    assert len(sim.cells_table()) == 2
+    assert sim._cells_table_cache[0] == sim._config_version
+
+
+def test_cells_frame_cache_keyed_to_version_before_build():
+    sim = _sim_with_cell()
+    before = sim._config_version
+    sim.cells = _BumpOnIter(sim, sim.cells)
+
+    assert len(sim.cells_frame()) == 1
+    assert sim._cells_frame_cache[0] == before
+
+    sim.cells = list(sim.cells)
+    sim.cells.append(dict(sim.cells[0], band="L", name="LSITE0001A1"))
+    assert len(sim.cells_frame()) == 2
+    assert sim._cells_frame_cache[0] == sim._config_version
@@ -0,0 +1,31 @@
+"""
+Tests for the sim_reports helpers in db.persist_run.
+
+Run from smartran-studio-sim-engine/: python -m pytest tests
+"""
+
+from arango.cursor import Cursor
+
+from db.persist_run import cursor_full_count
+
+
+def _cursor(stats):
+    # Shape of an AQL cursor response as returned by the server
+    return Cursor(None, {
+        "result": [{"user_id": 1}],
+        "hasMore": False,
+        "cached": False,
+        "count": 1,
+        "extra": {"stats": stats},
+    })
+
+
+def test_cursor_full_count_reads_fullcount_stat():
+    cursor = _cursor({"fullCount": 42, "scannedIndex": 1})
+    assert cursor_full_count(cursor) == 42
+
+
+def test_cursor_full_count_ignores_page_size():
+    cursor = _cursor({"fullCount": 1000})
+    assert len(list(cursor)) == 1
+    assert cursor_full_count(cursor) == 1000